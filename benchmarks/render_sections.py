@@ -0,0 +1,70 @@
+"""Benchmark sequential vs threaded section rendering on a very large CV.
+
+Run on both the GIL and free-threaded builds to compare:
+
+    uv run --python 3.14 benchmarks/render_sections.py
+    uv run --python 3.14t benchmarks/render_sections.py
+"""
+
+import os
+import sys
+import sysconfig
+import time
+from collections.abc import Callable
+from dataclasses import replace
+from functools import partial
+from pathlib import Path
+
+from cvcompiler.assets import AssetIndex
+from cvcompiler.generator import render_page
+from cvcompiler.models import CV
+from cvcompiler.parser import parse_cv
+from cvcompiler.themes import load_theme
+
+PROJECT_ROOT = Path(__file__).parent.parent
+SCALE = 40  # Copies of each repeated CV entry
+ROUNDS = 5
+
+
+def _large_cv() -> CV:
+    cv = parse_cv((PROJECT_ROOT / "cv.md").read_text(encoding="utf-8"))
+    return replace(
+        cv,
+        experiences=cv.experiences * SCALE,
+        skills=cv.skills * SCALE,
+        certifications=cv.certifications * SCALE,
+        education=cv.education * SCALE,
+        languages=cv.languages * SCALE,
+    )
+
+
+def _best_of(fn: Callable[[], object], rounds: int = ROUNDS) -> float:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    cv = _large_cv()
+    light, dark = load_theme("vivid"), load_theme("dark_purple")
+    assets = AssetIndex(PROJECT_ROOT)
+    free_threaded = bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+
+    print(f"Python {sys.version.split()[0]}, free-threaded build: {free_threaded}")
+    print(f"GIL enabled at runtime: {gil_enabled}, CPUs: {os.cpu_count()}")
+
+    render_page(cv, light, dark, assets)  # Warm up imports and caches
+    render = partial(render_page, cv, light, dark, assets)
+    baseline = _best_of(partial(render, jobs=1))
+    print(f"  jobs=1: {baseline * 1000:8.1f} ms")
+    for jobs in (2, 4, 8):
+        elapsed = _best_of(partial(render, jobs=jobs))
+        print(f"  jobs={jobs}: {elapsed * 1000:8.1f} ms  ({baseline / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,51 @@
 """CV Compiler - Convert Markdown CV to a beautiful static website."""
 
+import argparse
+import json
 import logging
+from dataclasses import asdict
 from datetime import datetime
 from pathlib import Path
 
-from .generator import generate_html, write_output
+from .assets import AssetIndex
+from .audit import AuditReport, audit_site, load_budget
+from .batch import BatchResult, compiler_hash, run_batch
+from .deploy import SYNC_WORKERS, load_deploy_plan, sync_plan, write_deploy_plan
+from .fingerprint import (
+    MissingAssetError,
+    UnsafeAssetPathError,
+    copy_assets,
+    fingerprint_assets,
+)
+from .fragments import referenced_fragments, write_fragments
+from .generator import render_page, write_output
+from .ingest import Record, check_source, iter_records
+from .journal import FSYNC_INTERVAL, FSYNC_POLICIES, JOURNAL_FILE, FsyncPolicy, Journal
+from .models import CV
 from .parser import parse_cv
+from .search import (
+    SEARCH_INDEX_FILE,
+    build_search_index,
+    search_index_json,
+    write_batch_index,
+)
+from .service_worker import (
+    build_precache_manifest,
+    generate_service_worker,
+    write_service_worker,
+)
 from .sitemap import generate_sitemap, write_sitemap
+from .store import STORE_DIR, AssetStore
 from .themes import Theme, list_available_themes, load_theme
+from .third_party import LOAD_STRATEGIES, LoadStrategy
 
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 logger = logging.getLogger(__name__)
 
 DEFAULT_LIGHT_THEME = "vivid"
 DEFAULT_DARK_THEME = "dark_purple"
+BUDGET_FILE = "budget.json"
+INGEST_OUTPUT_DIR = "sites"
 
 
 def _display_theme_options(themes: list[str], default: str) -> None:
@@ -63,42 +95,444 @@ def select_themes() -> tuple[Theme, Theme]:
     return light, dark
 
 
-def compile_cv(
-    source: Path, output_dir: Path, light_theme: Theme, dark_theme: Theme
+def build_site(
+    cv: CV,
+    asset_root: Path,
+    output_dir: Path,
+    light_theme: Theme,
+    dark_theme: Theme,
+    fingerprint: bool = False,
+    lazy_sections: bool = False,
+    service_worker: bool = False,
+    jobs: int = 1,
+    third_party: LoadStrategy = "idle",
+    prune_css: bool = False,
+    store: AssetStore | None = None,
 ) -> Path:
-    """Compile a CV markdown file to HTML."""
-    logger.info(f"📄 Reading {source.name}...")
-    content = source.read_text(encoding="utf-8")
-
-    logger.info("🔍 Parsing CV structure...")
-    cv = parse_cv(content)
+    """Write the website of a parsed CV to output_dir."""
+    assets = AssetIndex(asset_root)
+    if fingerprint:
+        logger.info("🔖 Fingerprinting assets...")
+        fingerprint_assets(cv, assets, output_dir, store)
+    elif output_dir.resolve() != asset_root.resolve():
+        # Pages reference images relative to themselves
+        copied = copy_assets(cv, assets, output_dir, store)
+        if copied:
+            logger.info(f"🖼️  Copied {len(copied)} assets")
 
     logger.info("🎨 Generating HTML...")
-    html = generate_html(cv, light_theme, dark_theme)
+    page = render_page(
+        cv,
+        light_theme,
+        dark_theme,
+        assets,
+        lazy=lazy_sections,
+        service_worker=service_worker,
+        jobs=jobs,
+        third_party=third_party,
+        prune_css=prune_css,
+    )
 
     output_file = output_dir / "index.html"
-    write_output(html, output_file)
+    previous_html = (
+        output_file.read_text(encoding="utf-8") if output_file.exists() else ""
+    )
+    page_changed = previous_html != page.html
+    write_output(page.html, output_file)
     logger.info(f"✨ Generated {output_file}")
 
-    if cv.canonical_url:
+    if page.fragments:
+        written = write_fragments(
+            page.fragments, output_dir, keep=referenced_fragments(previous_html)
+        )
+        logger.info(f"✨ Generated {len(written)} lazy-loaded section fragments")
+
+    if service_worker:
+        manifest = build_precache_manifest(cv, assets, page.fragments)
+        sw_file = write_service_worker(generate_service_worker(manifest), output_dir)
+        logger.info(f"✨ Generated {sw_file} ({len(manifest)} precached assets)")
+
+    sitemap_file = output_dir / "sitemap.xml"
+    # lastmod only moves when the page does, so unchanged sites stay unchanged
+    if cv.canonical_url and (page_changed or not sitemap_file.exists()):
         logger.info("🗺️  Generating sitemap.xml...")
         sitemap_xml = generate_sitemap(cv.canonical_url, datetime.now())
-        sitemap_file = output_dir / "sitemap.xml"
         write_sitemap(sitemap_xml, sitemap_file)
         logger.info(f"✨ Generated {sitemap_file}")
 
     return output_file
 
 
+def compile_cv(
+    source: Path,
+    output_dir: Path,
+    light_theme: Theme,
+    dark_theme: Theme,
+    fingerprint: bool = False,
+    lazy_sections: bool = False,
+    service_worker: bool = False,
+    jobs: int = 1,
+    third_party: LoadStrategy = "idle",
+    prune_css: bool = False,
+) -> Path:
+    """Compile a CV markdown file to HTML."""
+    logger.info(f"📄 Reading {source.name}...")
+    content = source.read_text(encoding="utf-8")
+
+    logger.info("🔍 Parsing CV structure...")
+    cv = parse_cv(content)
+
+    return build_site(
+        cv,
+        source.parent,
+        output_dir,
+        light_theme,
+        dark_theme,
+        fingerprint=fingerprint,
+        lazy_sections=lazy_sections,
+        service_worker=service_worker,
+        jobs=jobs,
+        third_party=third_party,
+        prune_css=prune_css,
+    )
+
+
+def ingest_cvs(
+    source: Path,
+    asset_root: Path,
+    output_dir: Path,
+    light_theme: Theme,
+    dark_theme: Theme,
+    fingerprint: bool = False,
+    lazy_sections: bool = False,
+    service_worker: bool = False,
+    jobs: int = 1,
+    third_party: LoadStrategy = "idle",
+    prune_css: bool = False,
+    workers: int = 1,
+    retry_failed: bool = False,
+    fsync: FsyncPolicy = "batch",
+) -> BatchResult:
+    """Compile every structured CV record as it is read, one site per record id.
+
+    Progress is checkpointed in output_dir/journal.jsonl so an interrupted
+    run resumes where it stopped.
+    """
+
+    # Sites share one copy of each distinct image, hardlinked into their img/
+    store = AssetStore(output_dir / STORE_DIR)
+
+    def build(record: Record, site_dir: Path) -> None:
+        build_site(
+            record.cv,
+            asset_root,
+            site_dir,
+            light_theme,
+            dark_theme,
+            fingerprint=fingerprint,
+            lazy_sections=lazy_sections,
+            service_worker=service_worker,
+            jobs=jobs,
+            third_party=third_party,
+            prune_css=prune_css,
+            store=store,
+        )
+        # Per-site index, merged into the batch-wide one once the batch is done
+        (site_dir / SEARCH_INDEX_FILE).write_text(
+            search_index_json(build_search_index(record.cv)) + "\n", encoding="utf-8"
+        )
+
+    # Changing themes, options, the asset root or the compiler invalidates
+    # every checkpoint
+    settings = json.dumps(
+        [
+            compiler_hash(),
+            str(asset_root.resolve()),
+            asdict(light_theme),
+            asdict(dark_theme),
+            fingerprint,
+            lazy_sections,
+            service_worker,
+            third_party,
+            prune_css,
+        ],
+        sort_keys=True,
+    )
+    with Journal(output_dir / JOURNAL_FILE, fsync=fsync) as journal:
+        return run_batch(
+            iter_records(source),
+            build,
+            output_dir,
+            journal,
+            settings=settings,
+            workers=workers,
+            retry_failed=retry_failed,
+            asset_root=asset_root,
+        )
+
+
+def audit_cv(
+    source: Path, output_dir: Path, budget_file: Path | None = None
+) -> AuditReport:
+    """Audit a compiled CV site against a performance budget."""
+    logger.info(f"📏 Auditing {output_dir / 'index.html'}...")
+    cv = parse_cv(source.read_text(encoding="utf-8"))
+    budget = load_budget(budget_file)
+    report = audit_site(output_dir, cv, AssetIndex(source.parent), budget)
+
+    for name, value in report.metrics.items():
+        limit = budget[name]
+        marker = "❌" if value > limit else "✅"
+        logger.info(f"  {marker} {name}: {value:,} / {limit:,}")
+    for issue in report.issues:
+        logger.info(f"  ⚠️  {issue}")
+
+    return report
+
+
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"expected an integer, got {value!r}"
+        ) from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="cvcompiler", description=__doc__)
+    parser.add_argument(
+        "--fingerprint",
+        action="store_true",
+        help="copy images to content-hashed filenames for immutable caching",
+    )
+    parser.add_argument(
+        "--lazy-sections",
+        action="store_true",
+        help="load sections below the fold as separate fragments (needs a web server)",
+    )
+    parser.add_argument(
+        "--service-worker",
+        action="store_true",
+        help="generate sw.js precaching images for instant repeat and offline visits",
+    )
+
+    parser.add_argument(
+        "--jobs",
+        type=_positive_int,
+        default=1,
+        help="render sections on this many threads (scales on free-threaded Python)",
+    )
+    parser.add_argument(
+        "--prune-css",
+        action="store_true",
+        help="drop styles.css rules whose selectors never match the generated page",
+    )
+    parser.add_argument(
+        "--third-party",
+        choices=LOAD_STRATEGIES,
+        default="idle",
+        help="when to load analytics and embed scripts: once the page is idle, "
+        "on first interaction, or never (preview builds)",
+    )
+
+    subparsers = parser.add_subparsers(dest="command")
+    audit = subparsers.add_parser(
+        "audit", help="check the compiled site against a performance budget"
+    )
+    audit.add_argument(
+        "--budget",
+        type=Path,
+        help=f"JSON file overriding default budget values (default: {BUDGET_FILE})",
+    )
+    audit.add_argument(
+        "--output-dir",
+        type=Path,
+        help="directory of the compiled site (default: project root)",
+    )
+
+    ingest = subparsers.add_parser(
+        "ingest", help="compile structured CV records (JSON Lines, JSON, TOML)"
+    )
+    ingest.add_argument(
+        "source",
+        type=Path,
+        help='.jsonl file, "-" for JSON Lines on stdin, or directory of .json/.toml',
+    )
+    ingest.add_argument(
+        "--output-dir",
+        type=Path,
+        help=f"one site per record id is written here (default: {INGEST_OUTPUT_DIR}/)",
+    )
+    ingest.add_argument(
+        "--assets-dir",
+        type=Path,
+        help="directory image paths in records are relative to (default: project root)",
+    )
+    ingest.add_argument("--light-theme", default=DEFAULT_LIGHT_THEME)
+    ingest.add_argument("--dark-theme", default=DEFAULT_DARK_THEME)
+    ingest.add_argument(
+        "--workers",
+        type=_positive_int,
+        default=1,
+        help="compile this many records concurrently",
+    )
+    ingest.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="only compile records whose last attempt failed in the journal",
+    )
+    ingest.add_argument(
+        "--fsync",
+        choices=FSYNC_POLICIES,
+        default="batch",
+        help=f"flush the journal to disk after every item, every {FSYNC_INTERVAL}, or never",
+    )
+
+    sync = subparsers.add_parser(
+        "sync", help="upload only the files the last ingest added or changed"
+    )
+    sync.add_argument(
+        "target", type=Path, help="deployed copy of the sites (or a mounted bucket)"
+    )
+    sync.add_argument(
+        "--output-dir",
+        type=Path,
+        help=f"ingest output directory (default: {INGEST_OUTPUT_DIR}/)",
+    )
+    sync.add_argument(
+        "--workers",
+        type=_positive_int,
+        default=SYNC_WORKERS,
+        help="concurrent file transfers",
+    )
+    return parser.parse_args()
+
+
+def _run_audit(args: argparse.Namespace, cv_path: Path, project_root: Path) -> None:
+    """Print the audit report as JSON on stdout; exit non-zero when over budget."""
+    budget_file = args.budget
+    if budget_file is None and (project_root / BUDGET_FILE).exists():
+        budget_file = project_root / BUDGET_FILE
+
+    output_dir = args.output_dir or project_root
+    if not (output_dir / "index.html").exists():
+        logger.error(f"❌ No compiled site found in {output_dir}")
+        raise SystemExit(1)
+
+    try:
+        report = audit_cv(cv_path, output_dir, budget_file)
+    except (OSError, ValueError) as e:
+        logger.error(f"❌ {e}")
+        raise SystemExit(1) from e
+    print(report.to_json())
+    if not report.passed:
+        logger.error(f"❌ Over budget: {', '.join(report.over_budget)}")
+        raise SystemExit(1)
+    logger.info("✅ Within budget")
+
+
+def _run_ingest(args: argparse.Namespace, project_root: Path) -> None:
+    """Compile records without prompting, so stdin stays free for the records."""
+    try:
+        check_source(args.source)
+        light_theme = load_theme(args.light_theme)
+        dark_theme = load_theme(args.dark_theme)
+    except ValueError as e:
+        logger.error(f"❌ {e}")
+        raise SystemExit(1) from e
+
+    output_dir = args.output_dir or project_root / INGEST_OUTPUT_DIR
+    result = ingest_cvs(
+        args.source,
+        args.assets_dir or project_root,
+        output_dir,
+        light_theme,
+        dark_theme,
+        fingerprint=args.fingerprint,
+        lazy_sections=args.lazy_sections,
+        service_worker=args.service_worker,
+        jobs=args.jobs,
+        third_party=args.third_party,
+        prune_css=args.prune_css,
+        workers=args.workers,
+        retry_failed=args.retry_failed,
+        fsync=args.fsync,
+    )
+    logger.info(
+        f"\n🚀 Compiled {result.compiled} CVs, {result.skipped} up to date, "
+        f"{result.failed} failed, {result.rejected} rejected"
+    )
+
+    index_path = write_batch_index(output_dir)
+    logger.info(f"🔎 Batch search index written to {index_path}")
+
+    plan = write_deploy_plan(output_dir)
+    logger.info(
+        f"📦 Deploy plan: {len(plan.uploads)} files to upload, "
+        f"{len(plan.deletions)} to delete across {len(plan.sites)} sites"
+    )
+    if result.failed or result.rejected:
+        raise SystemExit(1)
+
+
+def _run_sync(args: argparse.Namespace, project_root: Path) -> None:
+    """Apply the deploy plan of the last ingest to the target directory."""
+    output_dir = args.output_dir or project_root / INGEST_OUTPUT_DIR
+    try:
+        plan = load_deploy_plan(output_dir)
+    except FileNotFoundError as e:
+        logger.error(f"❌ {e} (run ingest first)")
+        raise SystemExit(1) from e
+
+    logger.info(f"🚚 Syncing {output_dir} to {args.target}...")
+    result = sync_plan(plan, output_dir, args.target, workers=args.workers)
+    logger.info(
+        f"✨ Uploaded {result.uploaded} files, deleted {result.deleted}, "
+        f"skipped {result.unchanged} unchanged"
+    )
+
+
 def main() -> None:
     """Entry point - compile cv.md from project root."""
+    args = _parse_args()
     project_root = Path(__file__).parent.parent.parent
+
+    if args.command == "ingest":
+        _run_ingest(args, project_root)
+        return
+    if args.command == "sync":
+        _run_sync(args, project_root)
+        return
+
     cv_path = project_root / "cv.md"
 
     if not cv_path.exists():
         logger.error(f"❌ CV file not found: {cv_path}")
         raise SystemExit(1)
 
+    if args.command == "audit":
+        _run_audit(args, cv_path, project_root)
+        return
+
     light_theme, dark_theme = select_themes()
-    compile_cv(cv_path, project_root, light_theme, dark_theme)
+    try:
+        compile_cv(
+            cv_path,
+            project_root,
+            light_theme,
+            dark_theme,
+            fingerprint=args.fingerprint,
+            lazy_sections=args.lazy_sections,
+            service_worker=args.service_worker,
+            jobs=args.jobs,
+            third_party=args.third_party,
+            prune_css=args.prune_css,
+        )
+    except (MissingAssetError, UnsafeAssetPathError) as e:
+        logger.error(f"❌ {e}")
+        raise SystemExit(1) from e
     logger.info("\n🚀 Done! Open index.html to view your CV.")
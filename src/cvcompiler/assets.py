@@ -0,0 +1,257 @@
+"""Image asset index: intrinsic dimensions, small-asset inlining, placeholders."""
+
+import base64
+import hashlib
+import struct
+from collections.abc import Iterator
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from stat import S_ISREG
+from typing import BinaryIO
+
+from markupsafe import Markup, escape
+
+from .models import CV
+
+# Assets smaller than this (bytes) are inlined as data URIs
+DEFAULT_INLINE_THRESHOLD = 4 * 1024
+
+# Opaque images larger than this (bytes) get a blurred placeholder while loading
+DEFAULT_PLACEHOLDER_THRESHOLD = 32 * 1024
+
+MIME_TYPES = {
+    "png": "image/png",
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+}
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# JPEG start-of-frame markers carrying the frame dimensions
+# (0xC4, 0xC8 and 0xCC share the range but are DHT, JPG and DAC)
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+JPEG_STANDALONE_MARKERS = frozenset([0x01, *range(0xD0, 0xD9)])
+
+
+@dataclass(frozen=True)
+class ImageInfo:
+    format: str
+    width: int
+    height: int
+    opaque: bool
+
+
+@dataclass(frozen=True)
+class Asset:
+    src: str  # URL to emit: original path or data URI
+    path: Path
+    size: int
+    info: ImageInfo | None
+    placeholder: bool = False
+
+    @property
+    def inlined(self) -> bool:
+        return self.src.startswith("data:")
+
+
+# -- Header probing --
+
+
+def _probe_png(header: bytes) -> ImageInfo | None:
+    if len(header) < 26 or header[12:16] != b"IHDR":
+        return None
+    width, height = struct.unpack(">II", header[16:24])
+    color_type = header[25]
+    # Greyscale (0) and truecolor (2) have no alpha channel
+    return ImageInfo("png", width, height, opaque=color_type in (0, 2))
+
+
+def _probe_webp(header: bytes) -> ImageInfo | None:
+    if len(header) < 30:
+        return None
+    chunk = header[12:16]
+    if chunk == b"VP8 " and header[23:26] == b"\x9d\x01\x2a":
+        width, height = struct.unpack("<HH", header[26:30])
+        return ImageInfo("webp", width & 0x3FFF, height & 0x3FFF, opaque=True)
+    if chunk == b"VP8L" and header[20] == 0x2F:
+        bits = int.from_bytes(header[21:25], "little")
+        width = (bits & 0x3FFF) + 1
+        height = ((bits >> 14) & 0x3FFF) + 1
+        has_alpha = bool(bits >> 28 & 1)
+        return ImageInfo("webp", width, height, opaque=not has_alpha)
+    if chunk == b"VP8X":
+        has_alpha = bool(header[20] & 0x10)
+        width = int.from_bytes(header[24:27], "little") + 1
+        height = int.from_bytes(header[27:30], "little") + 1
+        return ImageInfo("webp", width, height, opaque=not has_alpha)
+    return None
+
+
+def _probe_jpeg(stream: BinaryIO) -> ImageInfo | None:
+    """Walk JPEG marker segments until the start-of-frame header."""
+    stream.seek(2)
+    while True:
+        byte = stream.read(1)
+        if not byte:
+            return None
+        if byte != b"\xff":
+            continue
+        marker = stream.read(1)
+        while marker == b"\xff":  # Fill bytes
+            marker = stream.read(1)
+        if not marker:
+            return None
+        code = marker[0]
+        if code in JPEG_STANDALONE_MARKERS:
+            continue
+        length_bytes = stream.read(2)
+        if len(length_bytes) < 2:
+            return None
+        (length,) = struct.unpack(">H", length_bytes)
+        if code in JPEG_SOF_MARKERS:
+            frame = stream.read(5)
+            if len(frame) < 5:
+                return None
+            height, width = struct.unpack(">HH", frame[1:5])
+            return ImageInfo("jpeg", width, height, opaque=True)
+        stream.seek(length - 2, 1)
+
+
+def probe_image(path: Path) -> ImageInfo | None:
+    """Read intrinsic image dimensions from file headers (no pixel decoding)."""
+    with path.open("rb") as stream:
+        header = stream.read(32)
+        if header.startswith(PNG_SIGNATURE):
+            return _probe_png(header)
+        if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+            return _probe_webp(header)
+        if header.startswith(b"\xff\xd8"):
+            return _probe_jpeg(stream)
+    return None
+
+
+@lru_cache(maxsize=1024)
+def _probe_cached(path: Path, mtime_ns: int) -> ImageInfo | None:
+    """Cache probe results by path and modification time."""
+    return probe_image(path)
+
+
+@lru_cache(maxsize=1024)
+def _hash_cached(path: Path, mtime_ns: int) -> str:
+    with path.open("rb") as stream:
+        return hashlib.file_digest(stream, "sha256").hexdigest()
+
+
+def content_hash(path: Path) -> str:
+    """SHA-256 of a file's content, cached by path and modification time."""
+    return _hash_cached(path, path.stat().st_mtime_ns)
+
+
+@lru_cache(maxsize=256)
+def _data_uri_cached(path: Path, mtime_ns: int, mime: str) -> str:
+    encoded = base64.b64encode(path.read_bytes()).decode("ascii")
+    return f"data:{mime};base64,{encoded}"
+
+
+# -- References --
+
+
+def iter_asset_refs(cv: CV) -> Iterator[str]:
+    """Yield every local image path referenced by the CV, without duplicates."""
+    seen: set[str] = set()
+    candidates = [
+        cv.profile.image,
+        *(exp.logo for exp in cv.experiences),
+        *(p.image for exp in cv.experiences for p in exp.projects),
+        *(category.image for category in cv.skills),
+        *(edu.logo for edu in cv.education),
+    ]
+    for src in candidates:
+        if src and not is_remote(src) and src not in seen:
+            seen.add(src)
+            yield src
+
+
+def is_remote(src: str) -> bool:
+    return "://" in src or src.startswith(("data:", "//"))
+
+
+# -- Index --
+
+
+class AssetIndex:
+    """Resolve image references relative to a root directory.
+
+    Small images are inlined as data URIs, large opaque images are flagged
+    for a placeholder, and every known image carries its intrinsic size.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        inline_threshold: int = DEFAULT_INLINE_THRESHOLD,
+        placeholder_threshold: int = DEFAULT_PLACEHOLDER_THRESHOLD,
+    ) -> None:
+        self.root = root
+        self.inline_threshold = inline_threshold
+        self.placeholder_threshold = placeholder_threshold
+        # Original reference -> URL to emit instead (e.g. fingerprinted copy)
+        self.urls: dict[str, str] = {}
+
+    def resolve(self, src: str) -> Path:
+        return self.root / src
+
+    def get(self, src: str) -> Asset | None:
+        """Look up an image reference.
+
+        Returns None for remote references and for paths that are missing,
+        not regular files or unreadable.
+        """
+        if not src or is_remote(src):
+            return None
+        path = self.resolve(src)
+        url = self.urls.get(src, src)
+        try:
+            stat = path.stat()
+            if not S_ISREG(stat.st_mode):
+                return None
+            info = _probe_cached(path, stat.st_mtime_ns)
+            if info and stat.st_size < self.inline_threshold:
+                url = _data_uri_cached(path, stat.st_mtime_ns, MIME_TYPES[info.format])
+        except OSError:
+            return None
+
+        placeholder = bool(
+            info and info.opaque and stat.st_size >= self.placeholder_threshold
+        )
+        return Asset(
+            src=url,
+            path=path,
+            size=stat.st_size,
+            info=info,
+            placeholder=placeholder,
+        )
+
+    def url(self, src: str) -> str:
+        """URL to emit for an image reference (data URI, hashed or original)."""
+        asset = self.get(src)
+        return asset.src if asset else src
+
+    def img_attrs(self, src: str) -> Markup:
+        """Render src/width/height (and placeholder) attributes for an <img>."""
+        asset = self.get(src)
+        if asset is None:
+            return img_attrs(src)
+
+        attrs = [f'src="{escape(asset.src)}"']
+        if asset.info:
+            attrs.append(f'width="{asset.info.width}" height="{asset.info.height}"')
+        if asset.placeholder:
+            attrs.append("data-placeholder")
+        return Markup(" ".join(attrs))
+
+
+def img_attrs(src: str) -> Markup:
+    """Render a bare src attribute when no asset index is available."""
+    return Markup(f'src="{escape(src)}"')
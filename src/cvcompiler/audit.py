@@ -0,0 +1,223 @@
+"""Static performance-budget audit of a compiled CV site."""
+
+import gzip
+import json
+from dataclasses import asdict, dataclass, field
+from html.parser import HTMLParser
+from pathlib import Path
+
+from .assets import AssetIndex, iter_asset_refs
+from .fragments import FRAGMENTS_DIR, referenced_fragments
+from .models import CV
+from .third_party import SCRIPT_URL_PATTERN
+
+# Maximum value allowed for each metric; override any of them with a budget file
+DEFAULT_BUDGET: dict[str, int] = {
+    "html_bytes": 200_000,
+    "html_gzip_bytes": 40_000,
+    "inline_css_bytes": 60_000,
+    "inline_css_gzip_bytes": 12_000,
+    "inline_js_bytes": 30_000,
+    "inline_js_gzip_bytes": 8_000,
+    "external_requests": 6,
+    "image_bytes": 2_500_000,
+    "images_without_dimensions": 0,
+    "images_without_lazy_loading": 0,
+    "lcp_image_not_preloaded": 0,
+}
+
+
+class BudgetError(ValueError):
+    """Raised when a budget file cannot be read as limits for known metrics."""
+
+
+def _gzip_size(text: str) -> int:
+    return len(gzip.compress(text.encode("utf-8"), compresslevel=9, mtime=0))
+
+
+def _is_external(url: str) -> bool:
+    return url.startswith(("http://", "https://", "//"))
+
+
+class _PageScanner(HTMLParser):
+    """Collect inline code, external requests, images and preloads from HTML."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.css: list[str] = []
+        self.js: list[str] = []
+        self.external: list[str] = []
+        self.images: list[dict[str, str]] = []
+        self.preloaded_images: set[str] = set()
+        self._capture: list[str] | None = None
+        self._deferred = False
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        attr = {name: value or "" for name, value in attrs}
+        if tag == "style":
+            self._capture = self.css
+        elif tag == "script":
+            # Deferred third-party scripts (data-third-party) are requested too,
+            # as are the scripts their inline loaders inject
+            if attr.get("src"):
+                self._add_request(attr["src"])
+            else:
+                self._capture = self.js
+                self._deferred = "data-third-party" in attr
+        elif tag == "link":
+            rel = attr.get("rel", "").split()
+            if "stylesheet" in rel or "preload" in rel or "icon" in rel:
+                self._add_request(attr.get("href", ""))
+            if "preload" in rel and attr.get("as") == "image":
+                self.preloaded_images.add(attr.get("href", ""))
+        elif tag == "img":
+            self.images.append(attr)
+            self._add_request(attr.get("src", ""))
+        elif tag == "iframe":
+            self._add_request(attr.get("src", ""))
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in ("style", "script"):
+            self._capture = None
+            self._deferred = False
+
+    def handle_data(self, data: str) -> None:
+        if self._capture is not None:
+            self._capture.append(data)
+        if self._deferred:
+            for host in SCRIPT_URL_PATTERN.findall(data):
+                self._add_request(f"https://{host.lower()}")
+
+    def _add_request(self, url: str) -> None:
+        if _is_external(url) and url not in self.external:
+            self.external.append(url)
+
+
+@dataclass
+class AuditReport:
+    metrics: dict[str, int]
+    budget: dict[str, int]
+    issues: list[str] = field(default_factory=list)
+    external_urls: list[str] = field(default_factory=list)
+
+    @property
+    def over_budget(self) -> dict[str, dict[str, int]]:
+        return {
+            name: {"value": self.metrics[name], "budget": limit}
+            for name, limit in self.budget.items()
+            if name in self.metrics and self.metrics[name] > limit
+        }
+
+    @property
+    def passed(self) -> bool:
+        return not self.over_budget
+
+    def to_json(self) -> str:
+        data = {"passed": self.passed, "over_budget": self.over_budget, **asdict(self)}
+        return json.dumps(data, indent=2)
+
+
+def load_budget(path: Path | None) -> dict[str, int]:
+    """Load a JSON budget file on top of the default budget."""
+    budget = dict(DEFAULT_BUDGET)
+    if path is None:
+        return budget
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as e:
+        raise BudgetError(f"Invalid JSON in budget file {path}: {e}") from e
+    if not isinstance(data, dict):
+        raise BudgetError(f"Budget file {path} must contain a JSON object")
+    unknown = set(data) - set(DEFAULT_BUDGET)
+    if unknown:
+        raise BudgetError(
+            f"Unknown budget metrics in {path}: {', '.join(sorted(unknown))}"
+        )
+    invalid = [name for name, value in data.items() if type(value) is not int]
+    if invalid:
+        raise BudgetError(
+            f"Budget limits must be integers in {path}: {', '.join(sorted(invalid))}"
+        )
+    budget.update(data)
+    return budget
+
+
+def _image_issues(
+    images: list[dict[str, str]], preloaded: set[str]
+) -> tuple[dict[str, int], list[str]]:
+    """Check dimensions, lazy loading and LCP preload of <img> tags."""
+    issues: list[str] = []
+    missing_dimensions = 0
+    missing_lazy = 0
+    lcp_not_preloaded = 0
+
+    for position, img in enumerate(images):
+        src = img.get("src", "")
+        label = src if not src.startswith("data:") else f"inline image #{position + 1}"
+        if not (img.get("width") and img.get("height")):
+            missing_dimensions += 1
+            issues.append(f"{label}: missing width/height")
+        if position == 0:
+            # First image in document order is the LCP candidate (profile photo)
+            if not src.startswith("data:") and src not in preloaded:
+                lcp_not_preloaded = 1
+                issues.append(f"{label}: LCP image is not preloaded")
+        elif img.get("loading") != "lazy":
+            missing_lazy += 1
+            issues.append(f'{label}: missing loading="lazy"')
+
+    metrics = {
+        "images_without_dimensions": missing_dimensions,
+        "images_without_lazy_loading": missing_lazy,
+        "lcp_image_not_preloaded": lcp_not_preloaded,
+    }
+    return metrics, issues
+
+
+def audit_site(
+    output_dir: Path, cv: CV, assets: AssetIndex, budget: dict[str, int]
+) -> AuditReport:
+    """Measure a compiled site against a performance budget."""
+    html = (output_dir / "index.html").read_text(encoding="utf-8")
+    scanner = _PageScanner()
+    scanner.feed(html)
+
+    # Lazy-loaded fragments contribute images and requests, not initial bytes.
+    # Only those the page loads: older builds' fragments may still be on disk
+    fragments = _PageScanner()
+    for name in sorted(referenced_fragments(html)):
+        fragment = output_dir / FRAGMENTS_DIR / name
+        if fragment.is_file():
+            fragments.feed(fragment.read_text(encoding="utf-8"))
+    images = scanner.images + fragments.images
+    external = scanner.external + [
+        url for url in fragments.external if url not in scanner.external
+    ]
+
+    css = "".join(scanner.css)
+    js = "".join(scanner.js)
+
+    image_bytes = 0
+    for src in iter_asset_refs(cv):
+        asset = assets.get(src)
+        if asset and not asset.inlined:
+            image_bytes += asset.size
+
+    image_metrics, issues = _image_issues(images, scanner.preloaded_images)
+    metrics = {
+        "html_bytes": len(html.encode("utf-8")),
+        "html_gzip_bytes": _gzip_size(html),
+        "inline_css_bytes": len(css.encode("utf-8")),
+        "inline_css_gzip_bytes": _gzip_size(css),
+        "inline_js_bytes": len(js.encode("utf-8")),
+        "inline_js_gzip_bytes": _gzip_size(js),
+        "external_requests": len(external),
+        "image_bytes": image_bytes,
+        **image_metrics,
+    }
+    return AuditReport(
+        metrics=metrics,
+        budget=budget,
+        issues=issues,
+        external_urls=external,
+    )
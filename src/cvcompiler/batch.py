@@ -0,0 +1,152 @@
+"""Resumable, bounded-concurrency batch compilation of CV records."""
+
+import hashlib
+import json
+import logging
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from functools import cache
+from pathlib import Path
+
+from .assets import content_hash, iter_asset_refs
+from .ingest import Record, RecordError
+from .journal import Journal, JournalEntry, hash_outputs
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchResult:
+    compiled: int = 0
+    skipped: int = 0
+    failed: int = 0
+    rejected: int = 0
+
+
+@cache
+def compiler_hash() -> str:
+    """Hash of the compiler's own code and templates, so upgrades rebuild sites."""
+    digest = hashlib.sha256()
+    package_dir = Path(__file__).parent
+    for path in sorted(package_dir.rglob("*")):
+        if path.is_file() and path.suffix != ".pyc":
+            digest.update(path.relative_to(package_dir).as_posix().encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def source_hash(record: Record, settings: str, asset_root: Path | None = None) -> str:
+    """Hash a record with the build settings and the content of its images."""
+    assets: dict[str, str | None] = {}
+    if asset_root is not None:
+        for src in iter_asset_refs(record.cv):
+            path = asset_root / src
+            assets[src] = content_hash(path) if path.is_file() else None
+    data = json.dumps(
+        [asdict(record.cv), assets], sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(f"{settings}\n{data}".encode()).hexdigest()
+
+
+def _compile_item(
+    record: Record,
+    site_dir: Path,
+    digest: str,
+    build: Callable[[Record, Path], None],
+    journal: Journal,
+) -> JournalEntry | None:
+    """Build one site; None when the journal shows it is already up to date."""
+    if journal.is_complete(record.id, digest, site_dir):
+        return None
+
+    started = time.perf_counter()
+    try:
+        site_dir.mkdir(parents=True, exist_ok=True)
+        build(record, site_dir)
+    except (OSError, ValueError) as e:
+        return JournalEntry(
+            id=record.id,
+            status="failed",
+            source_hash=digest,
+            duration=time.perf_counter() - started,
+            error=str(e),
+        )
+    return JournalEntry(
+        id=record.id,
+        status="done",
+        source_hash=digest,
+        outputs=hash_outputs(site_dir),
+        duration=time.perf_counter() - started,
+    )
+
+
+def run_batch(
+    records: Iterable[Record | RecordError],
+    build: Callable[[Record, Path], None],
+    output_dir: Path,
+    journal: Journal,
+    settings: str = "",
+    workers: int = 1,
+    retry_failed: bool = False,
+    asset_root: Path | None = None,
+) -> BatchResult:
+    """Compile records into output_dir/<id>/, checkpointing each one in the journal.
+
+    Items recorded as done with the same source hash (record, settings and
+    images under asset_root) and intact outputs are skipped. With
+    retry_failed, only items whose last attempt failed are compiled. A record
+    whose id already appeared in the batch is rejected. At most `workers`
+    items build at once and at most twice that many records are held in
+    memory, however long the input is.
+    """
+    if workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
+
+    result = BatchResult()
+    retry = journal.failed_ids() if retry_failed else None
+    pending: set[Future[JournalEntry | None]] = set()
+    seen_ids: set[str] = set()
+
+    def collect(done: set[Future[JournalEntry | None]]) -> None:
+        # Journal writes stay on the calling thread, in completion order
+        for future in done:
+            entry = future.result()
+            if entry is None:
+                result.skipped += 1
+                continue
+            journal.append(entry)
+            if entry.status == "done":
+                result.compiled += 1
+                logger.info(f"✨ {entry.id} ({entry.duration:.2f}s)")
+            else:
+                result.failed += 1
+                logger.error(f"❌ {entry.id}: {entry.error}")
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for record in records:
+            if isinstance(record, RecordError):
+                logger.error(f"❌ {record}")
+                result.rejected += 1
+                continue
+            if record.id in seen_ids:
+                # Both would build into the same site directory
+                logger.error(f"❌ {record.id}: duplicate id, already in this batch")
+                result.rejected += 1
+                continue
+            seen_ids.add(record.id)
+            if retry is not None and record.id not in retry:
+                continue
+
+            digest = source_hash(record, settings, asset_root)
+            site_dir = output_dir / record.id
+            pending.add(
+                executor.submit(_compile_item, record, site_dir, digest, build, journal)
+            )
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+        collect(wait(pending).done)
+
+    return result
@@ -0,0 +1,210 @@
+"""Removal of CSS rules whose selectors cannot match the rendered page."""
+
+import re
+import textwrap
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+
+# Classes added or removed at runtime by scripts.js
+RUNTIME_CLASSES = frozenset(
+    {
+        "scrolled",
+        "menu-open",
+        "animated",
+        "hidden",
+        "aos-animate",
+        "active",
+        "search-match",
+        "search-dim",
+    }
+)
+
+# At-rules whose block holds nested rules rather than declarations
+GROUPING_AT_RULES = ("@media", "@supports", "@container", "@layer")
+
+COMMENT_PATTERN = re.compile(r"/\*.*?\*/", re.DOTALL)
+CLASS_PATTERN = re.compile(r"\.((?:[\w-]|\\.)+)")
+ID_PATTERN = re.compile(r"#((?:[\w-]|\\.)+)")
+ESCAPE_PATTERN = re.compile(r"\\(.)")
+ANIMATION_PATTERN = re.compile(r"animation(?:-name)?\s*:\s*([^;}]+)")
+
+
+@dataclass
+class _Rule:
+    prelude: str
+    body: str = ""
+    children: list[_Rule] = field(default_factory=list)
+
+
+class _TokenScanner(HTMLParser):
+    """Collect class names and ids used by the elements of an HTML document."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.classes: set[str] = set()
+        self.ids: set[str] = set()
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        for name, value in attrs:
+            if name == "class" and value:
+                self.classes.update(value.split())
+            elif name == "id" and value:
+                self.ids.add(value)
+
+
+def collect_tokens(*documents: str) -> tuple[set[str], set[str]]:
+    """Return the class names and ids used across HTML documents."""
+    scanner = _TokenScanner()
+    for html in documents:
+        scanner.feed(html)
+    scanner.close()
+    return scanner.classes, scanner.ids
+
+
+def _parse(css: str) -> list[_Rule]:
+    """Split a stylesheet into rules, nesting grouping at-rules."""
+    rules: list[_Rule] = []
+    pos = 0
+    while True:
+        start = css.find("{", pos)
+        semicolon = css.find(";", pos)
+        if 0 <= semicolon < start and css[pos:semicolon].strip().startswith("@"):
+            # Block-less at-rule such as @import or @charset
+            rules.append(_Rule(css[pos : semicolon + 1].strip()))
+            pos = semicolon + 1
+            continue
+        if start < 0:
+            return rules
+
+        depth = 1
+        end = start + 1
+        while depth:
+            depth += {"{": 1, "}": -1}.get(css[end], 0)
+            end += 1
+        prelude = css[pos:start].strip()
+        body = css[start + 1 : end - 1]
+        if prelude.startswith(GROUPING_AT_RULES):
+            rules.append(_Rule(prelude, children=_parse(body)))
+        else:
+            rules.append(_Rule(prelude, textwrap.dedent(body.strip("\n")).strip()))
+        pos = end
+
+
+def _split_selectors(prelude: str) -> list[str]:
+    """Split a selector list on top-level commas."""
+    selectors: list[str] = []
+    depth = 0
+    current = ""
+    for char in prelude:
+        if char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            selectors.append(current.strip())
+            current = ""
+            continue
+        current += char
+    selectors.append(current.strip())
+    return selectors
+
+
+def _strip_nested(selector: str) -> str:
+    """Drop attribute selectors and functional pseudo-class arguments."""
+    result = ""
+    depth = 0
+    for char in selector:
+        if char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif depth == 0:
+            result += char
+    return result
+
+
+def _can_match(selector: str, classes: set[str], ids: set[str]) -> bool:
+    """Whether every class and id the selector requires exists in the page.
+
+    Tags, attributes and pseudo-classes are assumed to match; the contents
+    of :not(), :is() and friends are never required.
+    """
+    simple = _strip_nested(selector)
+    needed_classes = {
+        ESCAPE_PATTERN.sub(r"\1", c) for c in CLASS_PATTERN.findall(simple)
+    }
+    needed_ids = {ESCAPE_PATTERN.sub(r"\1", i) for i in ID_PATTERN.findall(simple)}
+    return needed_classes <= classes and needed_ids <= ids
+
+
+def _prune_rules(rules: list[_Rule], classes: set[str], ids: set[str]) -> list[_Rule]:
+    kept: list[_Rule] = []
+    for rule in rules:
+        if rule.children:
+            children = _prune_rules(rule.children, classes, ids)
+            if children:
+                kept.append(_Rule(rule.prelude, children=children))
+        elif rule.prelude.startswith("@"):
+            kept.append(rule)
+        else:
+            selectors = [
+                s for s in _split_selectors(rule.prelude) if _can_match(s, classes, ids)
+            ]
+            if selectors:
+                kept.append(_Rule(", ".join(selectors), rule.body))
+    return kept
+
+
+def _animation_names(rules: list[_Rule]) -> set[str]:
+    names: set[str] = set()
+    for rule in rules:
+        names |= _animation_names(rule.children)
+        for value in ANIMATION_PATTERN.findall(rule.body):
+            names.update(value.replace(",", " ").split())
+    return names
+
+
+def _drop_unused_keyframes(rules: list[_Rule], used: set[str]) -> list[_Rule]:
+    kept: list[_Rule] = []
+    for rule in rules:
+        if rule.prelude.startswith(("@keyframes", "@-webkit-keyframes")):
+            if rule.prelude.split()[1] not in used:
+                continue
+        elif rule.children:
+            rule = _Rule(
+                rule.prelude, children=_drop_unused_keyframes(rule.children, used)
+            )
+        kept.append(rule)
+    return kept
+
+
+def _serialize(rules: list[_Rule], indent: str = "") -> str:
+    blocks: list[str] = []
+    for rule in rules:
+        if rule.children:
+            inner = _serialize(rule.children, indent + "    ")
+            blocks.append(f"{indent}{rule.prelude} {{\n{inner}\n{indent}}}")
+        elif not rule.body and rule.prelude.startswith("@"):
+            blocks.append(f"{indent}{rule.prelude}")
+        else:
+            body = textwrap.indent(rule.body, indent + "    ")
+            blocks.append(f"{indent}{rule.prelude} {{\n{body}\n{indent}}}")
+    return "\n\n".join(blocks)
+
+
+def remove_unused_rules(
+    css: str,
+    classes: set[str],
+    ids: set[str],
+    runtime_classes: frozenset[str] = RUNTIME_CLASSES,
+) -> str:
+    """Remove rules whose selectors need a class or id the page never has.
+
+    Comments are dropped and keyframes are kept only while a remaining rule
+    animates with them. Element, attribute and pseudo-state selectors and
+    custom properties on :root are kept as they are.
+    """
+    rules = _parse(COMMENT_PATTERN.sub("", css))
+    rules = _prune_rules(rules, classes | runtime_classes, ids)
+    rules = _drop_unused_keyframes(rules, _animation_names(rules))
+    return _serialize(rules)
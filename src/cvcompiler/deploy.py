@@ -0,0 +1,166 @@
+"""Delta deploy plans between builds, and syncing them to a target directory."""
+
+import json
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from .journal import hash_outputs
+
+# Deploy state kept next to the batch output, never uploaded
+DEPLOY_DIR = ".deploy"
+MANIFEST_FILE = "manifest.json"
+PLAN_FILE = "plan.json"
+
+# Concurrent file transfers during sync
+SYNC_WORKERS = 8
+
+# site id -> relative file path -> sha256
+type Manifest = dict[str, dict[str, str]]
+
+
+@dataclass
+class SitePlan:
+    site: str
+    added: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+    deleted: list[str] = field(default_factory=list)
+
+
+@dataclass
+class DeployPlan:
+    sites: list[SitePlan]
+    manifest: Manifest
+
+    @property
+    def uploads(self) -> list[str]:
+        """Paths to upload, relative to the batch output directory."""
+        return [
+            f"{plan.site}/{name}"
+            for plan in self.sites
+            for name in [*plan.added, *plan.changed]
+        ]
+
+    @property
+    def deletions(self) -> list[str]:
+        return [f"{plan.site}/{name}" for plan in self.sites for name in plan.deleted]
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), indent=2)
+
+
+@dataclass
+class SyncResult:
+    uploaded: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+
+
+def build_manifest(output_dir: Path) -> Manifest:
+    """Hash every file of every site (subdirectory with an index.html)."""
+    return {
+        site.name: hash_outputs(site)
+        for site in sorted(output_dir.iterdir())
+        if (site / "index.html").is_file()
+    }
+
+
+def load_manifest(path: Path) -> Manifest:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def plan_deploy(previous: Manifest, current: Manifest) -> DeployPlan:
+    """List files added, changed (by content hash) or deleted per site."""
+    sites: list[SitePlan] = []
+    for site in sorted(previous.keys() | current.keys()):
+        old = previous.get(site, {})
+        new = current.get(site, {})
+        plan = SitePlan(
+            site=site,
+            added=sorted(new.keys() - old.keys()),
+            changed=sorted(n for n in new.keys() & old.keys() if new[n] != old[n]),
+            deleted=sorted(old.keys() - new.keys()),
+        )
+        if plan.added or plan.changed or plan.deleted:
+            sites.append(plan)
+    return DeployPlan(sites=sites, manifest=current)
+
+
+def write_deploy_plan(output_dir: Path) -> DeployPlan:
+    """Plan the deploy of output_dir against the last synced manifest."""
+    deploy_dir = output_dir / DEPLOY_DIR
+    previous = load_manifest(deploy_dir / MANIFEST_FILE)
+    plan = plan_deploy(previous, build_manifest(output_dir))
+    deploy_dir.mkdir(exist_ok=True)
+    (deploy_dir / PLAN_FILE).write_text(plan.to_json() + "\n", encoding="utf-8")
+    return plan
+
+
+def load_deploy_plan(output_dir: Path) -> DeployPlan:
+    path = output_dir / DEPLOY_DIR / PLAN_FILE
+    if not path.exists():
+        raise FileNotFoundError(f"No deploy plan found at {path}")
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return DeployPlan(
+        sites=[SitePlan(**site) for site in data["sites"]],
+        manifest=data["manifest"],
+    )
+
+
+def _upload(source: Path, target: Path) -> None:
+    # Copy next to the target then rename, so readers never see a partial file
+    target.parent.mkdir(parents=True, exist_ok=True)
+    partial = target.with_name(f".{target.name}.partial")
+    shutil.copyfile(source, partial)
+    os.replace(partial, target)
+
+
+def _delete(target_dir: Path, name: str) -> None:
+    target = target_dir / name
+    target.unlink(missing_ok=True)
+    # Remove directories left empty, up to the site directory itself
+    for parent in target.relative_to(target_dir).parents[:-1]:
+        try:
+            (target_dir / parent).rmdir()
+        except OSError:
+            break
+
+
+def sync_plan(
+    plan: DeployPlan,
+    output_dir: Path,
+    target_dir: Path,
+    workers: int = SYNC_WORKERS,
+) -> SyncResult:
+    """Apply a deploy plan to target_dir on a bounded pool of workers.
+
+    Once every file is transferred, the plan's manifest becomes the baseline
+    of the next plan, so an interrupted sync is simply planned again.
+    """
+    if workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
+
+    uploads = plan.uploads
+    deletions = plan.deletions
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(
+            executor.map(
+                lambda name: _upload(output_dir / name, target_dir / name), uploads
+            )
+        )
+        list(executor.map(lambda name: _delete(target_dir, name), deletions))
+
+    manifest_path = output_dir / DEPLOY_DIR / MANIFEST_FILE
+    manifest_path.write_text(json.dumps(plan.manifest) + "\n", encoding="utf-8")
+    (output_dir / DEPLOY_DIR / PLAN_FILE).unlink()
+
+    total = sum(len(files) for files in plan.manifest.values())
+    return SyncResult(
+        uploaded=len(uploads),
+        deleted=len(deletions),
+        unchanged=total - len(uploads),
+    )
@@ -0,0 +1,125 @@
+"""Content-addressed asset fingerprinting for immutable caching."""
+
+import re
+import shutil
+from pathlib import Path, PurePosixPath
+
+from .assets import AssetIndex, content_hash, iter_asset_refs
+from .models import CV
+from .store import AssetStore
+
+# Hex characters of the content hash kept in fingerprinted filenames
+HASH_LENGTH = 10
+
+
+class MissingAssetError(FileNotFoundError):
+    """Raised when the CV references an asset that does not exist."""
+
+
+class UnsafeAssetPathError(ValueError):
+    """Raised when an asset reference points outside the asset root."""
+
+
+def fingerprinted_name(src: str, digest: str) -> str:
+    """Insert a content hash before the extension: img/a.jpg -> img/a.<hash>.jpg"""
+    path = PurePosixPath(src)
+    return str(path.with_name(f"{path.stem}.{digest[:HASH_LENGTH]}{path.suffix}"))
+
+
+def is_contained(src: str) -> bool:
+    """Whether a reference stays below its root (relative, without "..")."""
+    path = PurePosixPath(src.replace("\\", "/"))
+    return not path.is_absolute() and ".." not in path.parts and ":" not in src
+
+
+def _remove_stale_copies(target: Path, stem: str, suffix: str) -> None:
+    """Delete earlier fingerprinted copies of the same asset."""
+    pattern = re.compile(
+        rf"^{re.escape(stem)}\.[0-9a-f]{{{HASH_LENGTH}}}{re.escape(suffix)}$"
+    )
+    for sibling in target.parent.glob(f"{stem}.*{suffix}"):
+        if sibling != target and pattern.match(sibling.name):
+            sibling.unlink()
+
+
+def _check_refs(cv: CV, assets: AssetIndex) -> None:
+    """Reject references that are missing or would be copied outside the site."""
+    # Copies are written at the same relative path inside output_dir
+    unsafe = [src for src in iter_asset_refs(cv) if not is_contained(src)]
+    if unsafe:
+        raise UnsafeAssetPathError(
+            f"Assets referenced in CV must be relative paths inside the project: "
+            f"{', '.join(unsafe)}"
+        )
+
+    missing = [src for src in iter_asset_refs(cv) if not assets.resolve(src).is_file()]
+    if missing:
+        raise MissingAssetError(
+            f"Assets referenced in CV not found: {', '.join(missing)}"
+        )
+
+
+def _place(source: Path, digest: str, target: Path, store: AssetStore | None) -> None:
+    if store:
+        store.link(store.add(source, digest), target)
+    else:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(source, target)
+
+
+def copy_assets(
+    cv: CV, assets: AssetIndex, output_dir: Path, store: AssetStore | None = None
+) -> list[str]:
+    """Copy every asset referenced by the CV to the same path in output_dir.
+
+    Needed when the site is written away from the asset root without
+    fingerprinting. Inlined assets are skipped; copies whose content is
+    already current are left as they are. Returns the copied references.
+    """
+    _check_refs(cv, assets)
+
+    copied: list[str] = []
+    for src in iter_asset_refs(cv):
+        asset = assets.get(src)
+        if asset is None or asset.inlined:
+            continue
+
+        digest = content_hash(asset.path)
+        target = output_dir / src
+        if target.is_file() and content_hash(target) == digest:
+            continue
+        # Replace rather than overwrite: the old file may be a store hardlink
+        target.unlink(missing_ok=True)
+        _place(asset.path, digest, target, store)
+        copied.append(src)
+    return copied
+
+
+def fingerprint_assets(
+    cv: CV, assets: AssetIndex, output_dir: Path, store: AssetStore | None = None
+) -> dict[str, str]:
+    """Copy every asset referenced by the CV to a content-hashed filename.
+
+    Assets inlined as data URIs are skipped. The returned mapping
+    (original reference -> fingerprinted URL) is also registered on the
+    index so rendering emits the hashed URLs. With a shared store, files
+    are linked from the store instead of copied.
+    """
+    _check_refs(cv, assets)
+
+    urls: dict[str, str] = {}
+    for src in iter_asset_refs(cv):
+        asset = assets.get(src)
+        if asset is None or asset.inlined:
+            continue
+
+        digest = content_hash(asset.path)
+        url = fingerprinted_name(src, digest)
+        target = output_dir / url
+        if not target.exists():
+            _place(asset.path, digest, target, store)
+        _remove_stale_copies(target, PurePosixPath(src).stem, target.suffix)
+        urls[src] = url
+
+    assets.urls.update(urls)
+    return urls
@@ -0,0 +1,67 @@
+"""Lazy-loaded section fragments for large CVs."""
+
+import gzip
+import hashlib
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+from .fingerprint import HASH_LENGTH
+
+FRAGMENTS_DIR = "fragments"
+
+FRAGMENT_URL_PATTERN = re.compile(
+    rf"{FRAGMENTS_DIR}/([\w-]+\.[0-9a-f]{{{HASH_LENGTH}}}\.html)"
+)
+
+
+@dataclass(frozen=True)
+class Fragment:
+    section_id: str
+    title: str
+    html: str
+
+    @property
+    def content(self) -> bytes:
+        return (self.html + "\n").encode("utf-8")
+
+    @property
+    def url(self) -> str:
+        digest = hashlib.sha256(self.content).hexdigest()[:HASH_LENGTH]
+        return f"{FRAGMENTS_DIR}/{self.section_id}.{digest}.html"
+
+
+def referenced_fragments(html: str) -> set[str]:
+    """File names of the fragments a page loads."""
+    return set(FRAGMENT_URL_PATTERN.findall(html))
+
+
+def write_fragments(
+    fragments: list[Fragment], output_dir: Path, keep: set[str] | None = None
+) -> list[Path]:
+    """Write fragments with pre-compressed .gz copies; remove stale fragments.
+
+    Fragments named in keep (those of the previous page) survive one more
+    build, so readers still holding that page can load them.
+    """
+    target_dir = output_dir / FRAGMENTS_DIR
+    target_dir.mkdir(parents=True, exist_ok=True)
+
+    written: list[Path] = []
+    for fragment in fragments:
+        path = output_dir / fragment.url
+        content = fragment.content
+        path.write_bytes(content)
+        # mtime=0 keeps the compressed bytes reproducible across builds
+        path.with_name(f"{path.name}.gz").write_bytes(
+            gzip.compress(content, compresslevel=9, mtime=0)
+        )
+        written.append(path)
+
+    names = {p.name for p in written} | (keep or set())
+    current = names | {f"{name}.gz" for name in names}
+    for stale in target_dir.glob("*.html*"):
+        if stale.name not in current:
+            stale.unlink()
+
+    return written
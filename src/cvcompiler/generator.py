@@ -1,18 +1,58 @@
 """HTML generator using Jinja2 templates."""
 
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any
 
 from jinja2 import Environment, FileSystemLoader
+from markupsafe import Markup
 
+from .assets import AssetIndex, img_attrs
+from .css import collect_tokens, remove_unused_rules
 from .favicon import favicon_to_data_uri, generate_favicon_svg
+from .fragments import Fragment
 from .markdown import process_text
 from .models import CV
+from .search import build_search_index, embed_json, search_index_json
 from .themes import Theme
+from .third_party import LoadStrategy, defer_scripts, preconnect_hints
 
 TEMPLATES_DIR = Path(__file__).parent / "templates"
 
 
-def create_template_env() -> Environment:
+@dataclass(frozen=True)
+class Section:
+    id: str
+    title: str
+    template: str
+    embeds_key: str = ""  # Key in CV.html_embeds rendered after the section
+
+
+# Main content sections, in page order (immutable: shared by render threads)
+SECTIONS = (
+    Section("profile", "Profile", "profile.html", "profile"),
+    Section("experience", "Experience", "experience.html", "experience"),
+    Section(
+        "skills", "Skills & Technologies", "skills.html", "skills_and_technologies"
+    ),
+    Section("certifications", "Certifications", "certifications.html"),
+    Section("education", "Education", "education.html", "education"),
+    Section("languages", "Languages", "languages.html", "languages"),
+    Section("contact", "Contact", "contact.html", "contact"),
+)
+
+# Sections always rendered inline in lazy mode (above the fold)
+EAGER_SECTIONS = 1
+
+
+@dataclass
+class Page:
+    html: str
+    fragments: list[Fragment] = field(default_factory=list)
+
+
+def create_template_env(assets: AssetIndex | None = None) -> Environment:
     """Create Jinja2 environment with custom configuration."""
     env = Environment(
         loader=FileSystemLoader(TEMPLATES_DIR),
@@ -21,26 +61,116 @@ def create_template_env() -> Environment:
         lstrip_blocks=True,
     )
     env.filters["md"] = process_text
+    env.filters["img"] = assets.img_attrs if assets else img_attrs
+    env.filters["img_url"] = assets.url if assets else str
+    env.filters["defer_scripts"] = defer_scripts
     return env
 
 
-def generate_html(cv: CV, light_theme: Theme, dark_theme: Theme) -> str:
-    """Render CV data to HTML using templates."""
-    env = create_template_env()
+def render_section(
+    env: Environment, section: Section, context: dict[str, Any]
+) -> Markup:
+    """Render one main content section followed by its HTML embeds."""
+    cv: CV = context["cv"]
+    template = env.get_template("section.html")
+    html = template.render(
+        context,
+        template=section.template,
+        embeds=cv.html_embeds.get(section.embeds_key, []),
+    )
+    return Markup(html.strip())
+
+
+def render_sections(
+    env: Environment, context: dict[str, Any], jobs: int = 1
+) -> list[Markup]:
+    """Render all SECTIONS in page order, on a thread pool when jobs > 1.
+
+    Sections only read the shared context, so they render independently;
+    on a free-threaded (3.14t) build this uses one core per worker.
+    """
+    if jobs <= 1:
+        return [render_section(env, section, context) for section in SECTIONS]
+
+    # Compile templates up front so threads only hit the environment cache
+    env.get_template("section.html")
+    for section in SECTIONS:
+        env.get_template(section.template)
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(lambda s: render_section(env, s, context), SECTIONS))
+
+
+def render_page(
+    cv: CV,
+    light_theme: Theme,
+    dark_theme: Theme,
+    assets: AssetIndex | None = None,
+    lazy: bool = False,
+    service_worker: bool = False,
+    jobs: int = 1,
+    third_party: LoadStrategy = "idle",
+    prune_css: bool = False,
+) -> Page:
+    """Render CV data to an HTML page.
+
+    In lazy mode, sections after the first EAGER_SECTIONS are returned as
+    fragments and replaced in the page by placeholders that load them.
+    With service_worker, the page registers the generated sw.js.
+    Analytics and embed scripts load according to the third_party strategy.
+    With prune_css, styles.css rules that cannot match the page are dropped.
+    Sections render concurrently on `jobs` threads.
+    """
+    env = create_template_env(assets)
     template = env.get_template("base.html")
 
     # Generate favicon using initials and light theme colors
     favicon_svg = generate_favicon_svg(cv.profile.initials, light_theme)
     favicon_uri = favicon_to_data_uri(favicon_svg)
 
-    html = template.render(
-        cv=cv,
-        light_theme=light_theme,
-        dark_theme=dark_theme,
-        favicon_uri=favicon_uri,
-    ).strip()
+    search_terms = build_search_index(cv)
+    search_index = embed_json(search_index_json(search_terms)) if search_terms else ""
+
+    context: dict[str, Any] = {
+        "cv": cv,
+        "light_theme": light_theme,
+        "dark_theme": dark_theme,
+        "favicon_uri": favicon_uri,
+        "service_worker": service_worker,
+        "third_party": third_party,
+        "preconnects": preconnect_hints(cv, third_party),
+        "search_index": search_index,
+    }
+    styles = Markup(env.get_template("styles.css").render(context))
+
+    sections: list[Markup] = []
+    fragments: list[Fragment] = []
+    placeholder = env.get_template("placeholder.html")
+    rendered_sections = render_sections(env, context, jobs)
+    for index, (section, rendered) in enumerate(zip(SECTIONS, rendered_sections)):
+        if not lazy or index < EAGER_SECTIONS or not rendered:
+            sections.append(rendered)
+            continue
+        fragment = Fragment(section.id, section.title, str(rendered))
+        fragments.append(fragment)
+        sections.append(Markup(placeholder.render(fragment=fragment).strip()))
 
-    return html + "\n"
+    html = template.render(context, sections=sections, styles=styles).strip()
+    if prune_css:
+        # Fragments are part of the page once loaded, so their classes count too
+        classes, ids = collect_tokens(html, *(f.html for f in fragments))
+        html = html.replace(styles, remove_unused_rules(styles, classes, ids), 1)
+    return Page(html=html + "\n", fragments=fragments)
+
+
+def generate_html(
+    cv: CV,
+    light_theme: Theme,
+    dark_theme: Theme,
+    assets: AssetIndex | None = None,
+) -> str:
+    """Render CV data to HTML using templates."""
+    return render_page(cv, light_theme, dark_theme, assets).html
 
 
 def write_output(html: str, output_path: Path) -> None:
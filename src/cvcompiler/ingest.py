@@ -0,0 +1,159 @@
+"""Streaming ingest of structured CV records (JSON Lines, JSON, TOML)."""
+
+import json
+import re
+import sys
+import tomllib
+from collections.abc import Iterable, Iterator
+from dataclasses import MISSING, dataclass, fields, is_dataclass
+from pathlib import Path
+from typing import Any, get_args, get_origin, get_type_hints
+
+from .models import CV
+from .parser import _compute_initials
+
+# Reserved top-level key naming the output directory of a record
+RECORD_ID_KEY = "id"
+RECORD_ID_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
+
+DOCUMENT_SUFFIXES = (".json", ".toml")
+
+
+class RecordError(ValueError):
+    """Raised when a structured CV record does not match the CV schema."""
+
+
+@dataclass
+class Record:
+    id: str
+    cv: CV
+
+
+def _check(value: Any, hint: Any, path: str) -> Any:
+    """Validate a decoded JSON/TOML value against a type hint and convert it."""
+    origin = get_origin(hint)
+    if is_dataclass(hint) and isinstance(hint, type):
+        if not isinstance(value, dict):
+            raise RecordError(f"{path}: expected an object, got {type(value).__name__}")
+        return _build(hint, value, path)
+    if origin is list:
+        if not isinstance(value, list):
+            raise RecordError(f"{path}: expected a list, got {type(value).__name__}")
+        (item_hint,) = get_args(hint)
+        return [_check(item, item_hint, f"{path}[{i}]") for i, item in enumerate(value)]
+    if origin is dict:
+        if not isinstance(value, dict):
+            raise RecordError(f"{path}: expected an object, got {type(value).__name__}")
+        _, value_hint = get_args(hint)
+        return {
+            str(key): _check(item, value_hint, f"{path}.{key}")
+            for key, item in value.items()
+        }
+    if hint is int and (isinstance(value, bool) or not isinstance(value, int)):
+        raise RecordError(f"{path}: expected an integer, got {type(value).__name__}")
+    if hint is str and not isinstance(value, str):
+        raise RecordError(f"{path}: expected a string, got {type(value).__name__}")
+    return value
+
+
+def _build[T](cls: type[T], data: dict[str, Any], path: str) -> T:
+    """Instantiate a models dataclass from a mapping, rejecting unknown keys."""
+    hints = get_type_hints(cls)
+    known = {f.name: f for f in fields(cls)}  # type: ignore[arg-type]
+
+    unknown = set(data) - set(known)
+    if unknown:
+        raise RecordError(
+            f"{path or 'record'}: unknown fields {', '.join(sorted(unknown))}"
+        )
+
+    values: dict[str, Any] = {}
+    for name, f in known.items():
+        field_path = f"{path}.{name}" if path else name
+        if name in data:
+            values[name] = _check(data[name], hints[name], field_path)
+        elif f.default is MISSING and f.default_factory is MISSING:
+            raise RecordError(f"{field_path}: missing required field")
+    return cls(**values)
+
+
+def cv_from_dict(data: dict[str, Any]) -> CV:
+    """Validate a decoded record and map it onto the CV dataclasses."""
+    profile = data.get("profile")
+    if isinstance(profile, dict) and "initials" not in profile:
+        # Initials are derived from the name, like the Markdown parser does
+        name = profile.get("name")
+        if isinstance(name, str):
+            data = {**data, "profile": {**profile, "initials": _compute_initials(name)}}
+    return _build(CV, data, "")
+
+
+def _to_record(data: Any, default_id: str, location: str) -> Record:
+    if not isinstance(data, dict):
+        raise RecordError(f"{location}: expected an object, got {type(data).__name__}")
+    data = dict(data)
+    record_id = data.pop(RECORD_ID_KEY, default_id)
+    if not isinstance(record_id, str) or not RECORD_ID_PATTERN.match(record_id):
+        raise RecordError(f"{location}: invalid record id {record_id!r}")
+    try:
+        return Record(id=record_id, cv=cv_from_dict(data))
+    except RecordError as e:
+        raise RecordError(f"{location}: {e}") from e
+
+
+def _iter_lines(lines: Iterable[str], name: str) -> Iterator[Record | RecordError]:
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        location = f"{name}:{number}"
+        try:
+            data = json.loads(line)
+            yield _to_record(data, f"record-{number}", location)
+        except json.JSONDecodeError as e:
+            yield RecordError(f"{location}: invalid JSON: {e.msg}")
+        except RecordError as e:
+            yield e
+
+
+def _iter_documents(directory: Path) -> Iterator[Record | RecordError]:
+    for path in sorted(directory.iterdir()):
+        if path.suffix not in DOCUMENT_SUFFIXES or not path.is_file():
+            continue
+        try:
+            with path.open("rb") as f:
+                data = tomllib.load(f) if path.suffix == ".toml" else json.load(f)
+            yield _to_record(data, path.stem, path.name)
+        except (json.JSONDecodeError, tomllib.TOMLDecodeError) as e:
+            yield RecordError(f"{path.name}: invalid {path.suffix[1:].upper()}: {e}")
+        except RecordError as e:
+            yield e
+
+
+def check_source(source: Path) -> None:
+    """Raise ValueError unless source is "-", a .jsonl file or a directory."""
+    if str(source) == "-" or source.is_dir():
+        return
+    if not source.exists():
+        raise ValueError(f"Record source not found: {source}")
+    if not source.is_file() or source.suffix != ".jsonl":
+        raise ValueError(
+            f"Unsupported record source {source}: expected a .jsonl file, '-' "
+            f"for stdin, or a directory of {'/'.join(DOCUMENT_SUFFIXES)} documents"
+        )
+
+
+def iter_records(source: Path) -> Iterator[Record | RecordError]:
+    """Yield CV records one at a time from a JSON Lines file, stdin or directory.
+
+    `source` is a .jsonl file, "-" for JSON Lines on stdin, or a directory of
+    .json/.toml documents (one CV each). Invalid records are yielded as
+    RecordError instead of raising so a batch can carry on past them.
+    """
+    check_source(source)
+    if str(source) == "-":
+        yield from _iter_lines(sys.stdin, "<stdin>")
+    elif source.is_dir():
+        yield from _iter_documents(source)
+    else:
+        with source.open(encoding="utf-8") as f:
+            yield from _iter_lines(f, source.name)
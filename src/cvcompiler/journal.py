@@ -0,0 +1,133 @@
+"""Append-only checkpoint journal for resumable batch compilation."""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Literal, Self
+
+JOURNAL_FILE = "journal.jsonl"
+
+type FsyncPolicy = Literal["always", "batch", "never"]
+FSYNC_POLICIES: tuple[FsyncPolicy, ...] = ("always", "batch", "never")
+
+# Entries written between two fsyncs with the "batch" policy
+FSYNC_INTERVAL = 100
+
+
+@dataclass
+class JournalEntry:
+    id: str
+    status: Literal["done", "failed"]
+    source_hash: str
+    outputs: dict[str, str] = field(default_factory=dict)  # relative path -> sha256
+    duration: float = 0.0
+    error: str = ""
+
+
+# Hashes of hardlinked files (e.g. shared store assets) by device and inode
+_linked_hashes: dict[tuple[int, int, int], str] = {}
+
+
+def file_hash(path: Path) -> str:
+    """SHA-256 of a file, computed once for all hardlinks to the same data."""
+    stat = path.stat()
+    key = (stat.st_dev, stat.st_ino, stat.st_mtime_ns)
+    if stat.st_nlink > 1 and key in _linked_hashes:
+        return _linked_hashes[key]
+
+    with path.open("rb") as f:
+        digest = hashlib.file_digest(f, "sha256").hexdigest()
+    if stat.st_nlink > 1:
+        _linked_hashes[key] = digest
+    return digest
+
+
+def hash_outputs(site_dir: Path) -> dict[str, str]:
+    """Hash every file of a compiled site, keyed by POSIX path relative to it."""
+    return {
+        path.relative_to(site_dir).as_posix(): file_hash(path)
+        for path in sorted(site_dir.rglob("*"))
+        if path.is_file()
+    }
+
+
+class Journal:
+    """JSON Lines journal of completed and failed batch items.
+
+    The last entry recorded for an id wins, so a retried item simply appends
+    a new entry. A line truncated by a crash mid-write is ignored on load.
+    """
+
+    def __init__(self, path: Path, fsync: FsyncPolicy = "batch") -> None:
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(
+                f"Unknown fsync policy {fsync!r}, expected one of {FSYNC_POLICIES}"
+            )
+        self.path = path
+        self.fsync = fsync
+        self.entries: dict[str, JournalEntry] = {}
+        self._unsynced = 0
+        if path.exists():
+            self._load()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = path.open("a", encoding="utf-8")
+
+    def _load(self) -> None:
+        complete = 0
+        with self.path.open("rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                complete += len(line)
+                try:
+                    data = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self.entries[data["id"]] = JournalEntry(**data)
+
+        # Drop a partial last line so new entries start on a line of their own
+        if complete < self.path.stat().st_size:
+            os.truncate(self.path, complete)
+
+    def append(self, entry: JournalEntry) -> None:
+        self._file.write(json.dumps(asdict(entry), separators=(",", ":")) + "\n")
+        self._file.flush()
+        self.entries[entry.id] = entry
+        self._unsynced += 1
+        if self.fsync == "always" or (
+            self.fsync == "batch" and self._unsynced >= FSYNC_INTERVAL
+        ):
+            self.sync()
+
+    def sync(self) -> None:
+        if self._unsynced:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+    def close(self) -> None:
+        if self.fsync != "never":
+            self.sync()
+        self._file.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def is_complete(self, item_id: str, source_hash: str, site_dir: Path) -> bool:
+        """Whether an item was compiled from this source and its outputs are intact."""
+        entry = self.entries.get(item_id)
+        if entry is None or entry.status != "done":
+            return False
+        if entry.source_hash != source_hash:
+            return False
+        return all(
+            (site_dir / name).is_file() and file_hash(site_dir / name) == digest
+            for name, digest in entry.outputs.items()
+        )
+
+    def failed_ids(self) -> set[str]:
+        return {id for id, entry in self.entries.items() if entry.status == "failed"}
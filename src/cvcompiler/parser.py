@@ -1,7 +1,8 @@
 """Parser for CV markdown format."""
 
+import hashlib
 import re
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator
 
 from .markdown import extract_html_blocks
 from .models import (
@@ -34,6 +35,10 @@ GOOGLE_ANALYTICS_PATTERN = re.compile(r"^google_analytics_id\s*=\s*(.+)$", re.MU
 CANONICAL_URL_PATTERN = re.compile(r"^canonical_url\s*=\s*(.+)$", re.MULTILINE)
 
 
+# Sections that handle HTML embeds at item level (not section level)
+ITEM_LEVEL_EMBED_SECTIONS = {"Certification"}
+
+
 def parse_cv(content: str) -> CV:
     """Parse markdown CV content into structured data."""
     # Extract metadata from preamble (before first section)
@@ -42,21 +47,13 @@ def parse_cv(content: str) -> CV:
 
     raw_sections = _split_sections(content)
 
-    # Sections that handle HTML embeds at item level (not section level)
-    item_level_embed_sections = {"Certification"}
-
     # Extract HTML blocks from sections that don't handle them at item level
     sections: dict[str, str] = {}
     html_embeds: dict[str, list[str]] = {}
     for name, section_content in raw_sections.items():
-        if name in item_level_embed_sections:
-            # Pass raw content - parser handles HTML extraction per item
-            sections[name] = section_content
-        else:
-            cleaned, blocks = extract_html_blocks(section_content)
-            sections[name] = cleaned
-            if blocks:
-                html_embeds[name.lower().replace(" ", "_")] = blocks
+        sections[name], blocks = _extract_section_embeds(name, section_content)
+        if blocks:
+            html_embeds[_embeds_key(name)] = blocks
 
     return CV(
         profile=_parse_profile(sections.get("Profile", "")),
@@ -73,6 +70,18 @@ def parse_cv(content: str) -> CV:
     )
 
 
+def _embeds_key(section_name: str) -> str:
+    return section_name.lower().replace(" ", "_")
+
+
+def _extract_section_embeds(name: str, content: str) -> tuple[str, list[str]]:
+    """Split section-level HTML blocks from section content."""
+    if name in ITEM_LEVEL_EMBED_SECTIONS:
+        # Pass raw content - parser handles HTML extraction per item
+        return content, []
+    return extract_html_blocks(content)
+
+
 def _extract_google_analytics_id(content: str) -> str:
     """Extract Google Analytics ID from markdown preamble."""
     match = GOOGLE_ANALYTICS_PATTERN.search(content)
@@ -277,49 +286,56 @@ def _parse_header_with_link(header: str) -> tuple[str, str, str] | None:
     return None
 
 
-def _parse_experiences(content: str) -> list[Experience]:
-    experiences: list[Experience] = []
+def _has_linked_header(block: str) -> bool:
+    """Check if a ### block has a 'Title @ [Name](url)' header."""
+    header = block.split("\n", 1)[0][4:].strip()
+    return _parse_header_with_link(header) is not None
 
-    for block in _split_blocks(content, "###"):
-        lines = block.split("\n")
-        header = lines[0][4:].strip()  # Remove "### "
 
-        parsed = _parse_header_with_link(header)
-        if not parsed:
-            continue
-
-        title, company, company_url = parsed
-        period, location = _parse_period_location(lines[1:])
-
-        # Extract logo (first image after period/location, before projects)
-        logo = _extract_logo(lines[1:])
+def _parse_experiences(content: str) -> list[Experience]:
+    return [
+        experience
+        for block in _split_blocks(content, "###")
+        if (experience := _parse_experience_block(block))
+    ]
 
-        # Check for projects (##### headings)
-        has_projects = SECTION_H5 in block
-        projects = list(_parse_projects(block)) if has_projects else []
 
-        # Extract description and tech_stack (only relevant for experiences without projects)
-        if has_projects:
-            description: list[str] = []
-            tech_stack: list[str] = []
-        else:
-            description, tech_stack = _extract_experience_content(lines[1:])
-
-        experiences.append(
-            Experience(
-                title=title,
-                company=company,
-                company_url=company_url,
-                period=period,
-                location=location,
-                description=description,
-                tech_stack=tech_stack,
-                projects=projects,
-                logo=logo,
-            )
-        )
-
-    return experiences
+def _parse_experience_block(block: str) -> Experience | None:
+    lines = block.split("\n")
+    header = lines[0][4:].strip()  # Remove "### "
+
+    parsed = _parse_header_with_link(header)
+    if not parsed:
+        return None
+
+    title, company, company_url = parsed
+    period, location = _parse_period_location(lines[1:])
+
+    # Extract logo (first image after period/location, before projects)
+    logo = _extract_logo(lines[1:])
+
+    # Check for projects (##### headings)
+    has_projects = SECTION_H5 in block
+    projects = list(_parse_projects(block)) if has_projects else []
+
+    # Extract description and tech_stack (only relevant for experiences without projects)
+    if has_projects:
+        description: list[str] = []
+        tech_stack: list[str] = []
+    else:
+        description, tech_stack = _extract_experience_content(lines[1:])
+
+    return Experience(
+        title=title,
+        company=company,
+        company_url=company_url,
+        period=period,
+        location=location,
+        description=description,
+        tech_stack=tech_stack,
+        projects=projects,
+        logo=logo,
+    )
 
 
 # -- Projects --
@@ -400,103 +416,102 @@ def _parse_projects(block: str) -> Iterator[Project]:
 
 
 def _parse_skills(content: str) -> list[SkillCategory]:
-    categories: list[SkillCategory] = []
+    return [_parse_skill_block(block) for block in _split_blocks(content, "###")]
 
-    for block in _split_blocks(content, "###"):
-        lines = block.split("\n")
-        title = lines[0][4:].strip()
 
-        image = ""
-        items: list[str] = []
+def _parse_skill_block(block: str) -> SkillCategory:
+    lines = block.split("\n")
+    title = lines[0][4:].strip()
 
-        for line in lines[1:]:
-            url = _extract_image_url(line)
-            if url:
-                image = url
-            elif _is_bullet_item(line):
-                items.append(_extract_bullet_text(line))
+    image = ""
+    items: list[str] = []
 
-        categories.append(SkillCategory(title=title, image=image, items=items))
+    for line in lines[1:]:
+        url = _extract_image_url(line)
+        if url:
+            image = url
+        elif _is_bullet_item(line):
+            items.append(_extract_bullet_text(line))
 
-    return categories
+    return SkillCategory(title=title, image=image, items=items)
 
 
 # -- Certifications --
 
 
 def _parse_certifications(content: str) -> list[Certification]:
-    certs: list[Certification] = []
+    return [
+        _parse_certification_block(block) for block in _split_blocks(content, "###")
+    ]
 
-    for block in _split_blocks(content, "###"):
-        # Extract HTML blocks embedded in this certification
-        cleaned_block, html_blocks = extract_html_blocks(block)
-        html_embed = "\n".join(html_blocks)
-
-        lines = cleaned_block.split("\n")
-        title = lines[0][4:].strip()
-        description = " ".join(
-            ln.strip() for ln in lines[1:] if ln.strip() and not ln.startswith("#")
-        )
-        certs.append(
-            Certification(title=title, description=description, html_embed=html_embed)
-        )
 
-    return certs
+def _parse_certification_block(block: str) -> Certification:
+    # Extract HTML blocks embedded in this certification
+    cleaned_block, html_blocks = extract_html_blocks(block)
+    html_embed = "\n".join(html_blocks)
+
+    lines = cleaned_block.split("\n")
+    title = lines[0][4:].strip()
+    description = " ".join(
+        ln.strip() for ln in lines[1:] if ln.strip() and not ln.startswith("#")
+    )
+    return Certification(title=title, description=description, html_embed=html_embed)
 
 
 # -- Education --
 
 
 def _parse_education(content: str) -> list[Education]:
-    entries: list[Education] = []
+    return [
+        entry
+        for block in _split_blocks(content, "###")
+        if (entry := _parse_education_block(block))
+    ]
 
-    for block in _split_blocks(content, "###"):
-        lines = block.split("\n")
-        header = lines[0][4:].strip()
 
-        parsed = _parse_header_with_link(header)
-        if not parsed:
-            continue
+def _parse_education_block(block: str) -> Education | None:
+    lines = block.split("\n")
+    header = lines[0][4:].strip()
 
-        degree, institution, institution_url = parsed
+    parsed = _parse_header_with_link(header)
+    if not parsed:
+        return None
 
-        # Period and location from line like "2013-2016 - Mons, Belgium"
-        period, location = "", ""
-        for line in lines[1:]:
-            stripped = line.strip()
-            if re.match(r"^\d{4}", stripped):
-                parts = stripped.split(" - ", 1)
-                period = parts[0].strip()
-                location = parts[1].strip() if len(parts) > 1 else ""
-                break
+    degree, institution, institution_url = parsed
 
-        # Extract logo
-        logo = _extract_logo(lines[1:])
+    # Period and location from line like "2013-2016 - Mons, Belgium"
+    period, location = "", ""
+    for line in lines[1:]:
+        stripped = line.strip()
+        if re.match(r"^\d{4}", stripped):
+            parts = stripped.split(" - ", 1)
+            period = parts[0].strip()
+            location = parts[1].strip() if len(parts) > 1 else ""
+            break
 
-        # Topics (bullet points) and distinction
-        topics: list[str] = []
-        distinction = ""
-        for line in lines[1:]:
-            stripped = line.strip()
-            if _is_bullet_item(line):
-                topics.append(_extract_bullet_text(line))
-            elif "distinction" in stripped.lower() or "obtained" in stripped.lower():
-                distinction = stripped
-
-        entries.append(
-            Education(
-                degree=degree,
-                institution=institution,
-                institution_url=institution_url,
-                period=period,
-                location=location,
-                topics=topics,
-                distinction=distinction,
-                logo=logo,
-            )
-        )
+    # Extract logo
+    logo = _extract_logo(lines[1:])
 
-    return entries
+    # Topics (bullet points) and distinction
+    topics: list[str] = []
+    distinction = ""
+    for line in lines[1:]:
+        stripped = line.strip()
+        if _is_bullet_item(line):
+            topics.append(_extract_bullet_text(line))
+        elif "distinction" in stripped.lower() or "obtained" in stripped.lower():
+            distinction = stripped
+
+    return Education(
+        degree=degree,
+        institution=institution,
+        institution_url=institution_url,
+        period=period,
+        location=location,
+        topics=topics,
+        distinction=distinction,
+        logo=logo,
+    )
 
 
 # -- Languages --
@@ -536,3 +551,116 @@ def _parse_links(content: str) -> list[Link]:
             links.append(Link(name=email, url=f"mailto:{email}"))
 
     return links
+
+
+# -- Incremental parsing --
+
+
+def _digest(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def _always(block: str) -> bool:
+    return True
+
+
+def _reparse_blocks[T](
+    old_content: str,
+    old_items: list[T],
+    content: str,
+    parse_block: Callable[[str], T | None],
+    yields_item: Callable[[str], bool] = _always,
+) -> list[T]:
+    """Parse ### blocks, reusing the previous item of every unchanged block."""
+    old_blocks = [b for b in _split_blocks(old_content, "###") if yields_item(b)]
+
+    # Only reuse items when previous blocks and items line up one-to-one
+    reusable: dict[bytes, list[T]] = {}
+    if len(old_blocks) == len(old_items):
+        for block, old_item in zip(old_blocks, old_items):
+            reusable.setdefault(_digest(block), []).append(old_item)
+
+    items: list[T] = []
+    for block in _split_blocks(content, "###"):
+        candidates = reusable.get(_digest(block))
+        item: T | None = candidates.pop(0) if candidates else parse_block(block)
+        if item is not None:
+            items.append(item)
+    return items
+
+
+def parse_cv_incremental(previous_content: str, previous: CV, content: str) -> CV:
+    """Parse markdown CV content, reparsing only what changed.
+
+    `previous` must be the result of parsing `previous_content`. Top-level
+    sections and their ### blocks are compared by hash; unchanged ones reuse
+    the previous model objects by identity so downstream caches keep hitting.
+    """
+    if content == previous_content:
+        return previous
+
+    old_sections = _split_sections(previous_content)
+    new_sections = _split_sections(content)
+    changed = {
+        name
+        for name in old_sections.keys() | new_sections.keys()
+        if _digest(old_sections.get(name, "")) != _digest(new_sections.get(name, ""))
+    }
+
+    html_embeds: dict[str, list[str]] = {}
+    for name, section_content in new_sections.items():
+        key = _embeds_key(name)
+        if name not in changed:
+            if key in previous.html_embeds:
+                html_embeds[key] = previous.html_embeds[key]
+            continue
+        _, blocks = _extract_section_embeds(name, section_content)
+        if blocks:
+            html_embeds[key] = blocks
+
+    def cleaned(sections: dict[str, str], name: str) -> str:
+        return _extract_section_embeds(name, sections.get(name, ""))[0]
+
+    def reparse_section[T](name: str, old: T, parse: Callable[[str], T]) -> T:
+        return parse(cleaned(new_sections, name)) if name in changed else old
+
+    def reparse_blocks[T](
+        name: str,
+        old_items: list[T],
+        parse_block: Callable[[str], T | None],
+        yields_item: Callable[[str], bool] = _always,
+    ) -> list[T]:
+        if name not in changed:
+            return old_items
+        return _reparse_blocks(
+            cleaned(old_sections, name),
+            old_items,
+            cleaned(new_sections, name),
+            parse_block,
+            yields_item,
+        )
+
+    return CV(
+        profile=reparse_section("Profile", previous.profile, _parse_profile),
+        experiences=reparse_blocks(
+            "Experience",
+            previous.experiences,
+            _parse_experience_block,
+            _has_linked_header,
+        ),
+        skills=reparse_blocks(
+            "Skills and Technologies", previous.skills, _parse_skill_block
+        ),
+        certifications=reparse_blocks(
+            "Certification", previous.certifications, _parse_certification_block
+        ),
+        education=reparse_blocks(
+            "Education", previous.education, _parse_education_block, _has_linked_header
+        ),
+        languages=reparse_section("Languages", previous.languages, _parse_languages),
+        contact=reparse_section("Contact", previous.contact, _parse_links),
+        socials=reparse_section("Socials", previous.socials, _parse_links),
+        html_embeds=html_embeds,
+        google_analytics_id=_extract_google_analytics_id(content),
+        canonical_url=_extract_canonical_url(content),
+    )
@@ -0,0 +1,110 @@
+"""Build-time inverted index of skills, tech stacks and project roles."""
+
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from markupsafe import Markup
+
+from .models import CV
+
+SEARCH_INDEX_FILE = "search-index.json"
+
+# "Python + FastAPI", "Azure OpenAI, GPT" and "HTML & CSS" hold several terms
+TERM_SEPARATOR_PATTERN = re.compile(r"\s+[+&]\s+|\s*,\s*")
+MARKDOWN_PATTERN = re.compile(r"[*_`]+|\[([^\]]*)\]\([^)]*\)")
+
+# List endings that are not terms ("Azure OpenAI, GPT, etc.")
+FILLER_TERMS = frozenset({"etc", "..."})
+
+
+@dataclass
+class IndexEntry:
+    label: str  # Display form of the first occurrence
+    count: int = 0
+    refs: list[str] = field(default_factory=list)  # data-search-id of cards
+
+
+def normalize_term(term: str) -> str:
+    """Case- and whitespace-insensitive key for a term.
+
+    Mirrors normalizeTerm() in scripts.js (toLowerCase, not casefold), so
+    the browser looks up the same keys.
+    """
+    return " ".join(term.lower().split())
+
+
+def _strip_markdown(text: str) -> str:
+    return MARKDOWN_PATTERN.sub(lambda m: m.group(1) or "", text)
+
+
+def _add(index: dict[str, IndexEntry], term: str, ref: str) -> None:
+    term = term.strip(" .")
+    key = normalize_term(term)
+    if not key or key in FILLER_TERMS:
+        return
+    entry = index.setdefault(key, IndexEntry(label=term))
+    entry.count += 1
+    if ref not in entry.refs:
+        entry.refs.append(ref)
+
+
+def _add_items(index: dict[str, IndexEntry], items: list[str], ref: str) -> None:
+    for item in items:
+        for term in TERM_SEPARATOR_PATTERN.split(_strip_markdown(item)):
+            _add(index, term, ref)
+
+
+def build_search_index(cv: CV) -> dict[str, IndexEntry]:
+    """Map normalised terms to their usage count and the cards using them.
+
+    Refs match the data-search-id attributes of the templates: e<i> for an
+    experience header, p<i>-<j> for a project card, s<k> for a skill card.
+    """
+    index: dict[str, IndexEntry] = {}
+    for i, exp in enumerate(cv.experiences):
+        _add_items(index, exp.tech_stack, f"e{i}")
+        for j, project in enumerate(exp.projects):
+            _add_items(index, project.tech_stack, f"p{i}-{j}")
+            # Roles are phrases ("Coaching and onboarding of developers")
+            for role in project.role:
+                _add(index, _strip_markdown(role), f"p{i}-{j}")
+    for k, category in enumerate(cv.skills):
+        _add_items(index, category.items, f"s{k}")
+    return dict(sorted(index.items(), key=lambda item: (-item[1].count, item[0])))
+
+
+def search_index_json(index: dict[str, IndexEntry]) -> str:
+    """Minimal JSON: {term: [label, count, [refs]]}, most used terms first."""
+    data = {key: [e.label, e.count, e.refs] for key, e in index.items()}
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def embed_json(data: str) -> Markup:
+    """Make JSON safe to inline in a <script type="application/json">."""
+    return Markup(data.replace("<", "\\u003c"))
+
+
+def write_batch_index(output_dir: Path) -> Path:
+    """Merge every site's index into {term: [label, {site: count}]}.
+
+    Sites are read from their search-index.json, so sites skipped by a
+    resumed batch are included too.
+    """
+    merged: dict[str, list] = {}
+    for path in sorted(output_dir.glob(f"*/{SEARCH_INDEX_FILE}")):
+        site = path.parent.name
+        for key, (label, count, _refs) in json.loads(
+            path.read_text(encoding="utf-8")
+        ).items():
+            merged.setdefault(key, [label, {}])[1][site] = count
+
+    for entry in merged.values():
+        entry[1] = dict(sorted(entry[1].items(), key=lambda s: (-s[1], s[0])))
+    output_path = output_dir / SEARCH_INDEX_FILE
+    output_path.write_text(
+        json.dumps(merged, ensure_ascii=False, separators=(",", ":")) + "\n",
+        encoding="utf-8",
+    )
+    return output_path
@@ -0,0 +1,60 @@
+"""Service worker generation with a precache manifest for repeat visits."""
+
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from .assets import AssetIndex, content_hash, iter_asset_refs
+from .fingerprint import HASH_LENGTH
+from .fragments import Fragment
+from .generator import create_template_env
+from .models import CV
+
+SERVICE_WORKER_FILE = "sw.js"
+
+# Cross-origin hosts the page loads from; cached at runtime, revalidated in background
+RUNTIME_CACHE_ORIGINS = [
+    "https://cdn.tailwindcss.com",
+    "https://fonts.googleapis.com",
+    "https://fonts.gstatic.com",
+]
+
+
+@dataclass(frozen=True)
+class PrecacheEntry:
+    url: str
+    revision: str
+
+
+def build_precache_manifest(
+    cv: CV, assets: AssetIndex, fragments: list[Fragment] | None = None
+) -> list[PrecacheEntry]:
+    """List every same-origin asset the page references with its content hash."""
+    entries: list[PrecacheEntry] = []
+    for src in iter_asset_refs(cv):
+        asset = assets.get(src)
+        if asset is None or asset.inlined:
+            continue
+        revision = content_hash(asset.path)[:HASH_LENGTH]
+        entries.append(PrecacheEntry(url=asset.src, revision=revision))
+
+    # Fragment URLs already embed their content hash
+    for fragment in fragments or []:
+        entries.append(PrecacheEntry(url=fragment.url, revision=""))
+
+    return entries
+
+
+def generate_service_worker(manifest: list[PrecacheEntry]) -> str:
+    """Render sw.js with the precache manifest inlined."""
+    template = create_template_env().get_template("sw.js")
+    return template.render(
+        manifest=[asdict(entry) for entry in manifest],
+        runtime_origins=RUNTIME_CACHE_ORIGINS,
+    ).strip()
+
+
+def write_service_worker(script: str, output_dir: Path) -> Path:
+    """Write the service worker at the site root so it controls the whole page."""
+    output_path = output_dir / SERVICE_WORKER_FILE
+    output_path.write_text(script + "\n", encoding="utf-8")
+    return output_path
@@ -0,0 +1,43 @@
+"""Content-addressed asset store shared by every site of a batch build."""
+
+import os
+import shutil
+import threading
+from pathlib import Path
+
+# Store location inside the batch output directory (not a site, never deployed)
+STORE_DIR = ".assets"
+
+
+class AssetStore:
+    """Keep one copy of each distinct asset, hardlinked into every site using it.
+
+    Files are named after their SHA-256, so identical images referenced by
+    many CVs (or under different names) are stored once. Sites get hardlinks,
+    or copies when the filesystem does not support them.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def path_for(self, digest: str, suffix: str) -> Path:
+        return self.root / digest[:2] / f"{digest}{suffix.lower()}"
+
+    def add(self, source: Path, digest: str) -> Path:
+        """Store a file under its content hash, unless already stored."""
+        stored = self.path_for(digest, source.suffix)
+        if not stored.exists():
+            stored.parent.mkdir(parents=True, exist_ok=True)
+            # Concurrent builds may add the same asset; the rename is atomic
+            partial = stored.with_name(f".{stored.name}.{threading.get_ident()}")
+            shutil.copyfile(source, partial)
+            os.replace(partial, stored)
+        return stored
+
+    def link(self, stored: Path, target: Path) -> None:
+        """Place a stored asset at target, sharing its data when possible."""
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(stored, target)
+        except OSError:
+            shutil.copyfile(stored, target)
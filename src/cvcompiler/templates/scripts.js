@@ -72,7 +72,7 @@ if (mobileMenuBtn && mobileMenu) {
 // Scroll animations (simple AOS replacement)
 // ==========================================================================
 
-function initScrollAnimations() {
+function initScrollAnimations(root = document) {
     const observerOptions = {
         root: null,
         rootMargin: '0px',
@@ -90,18 +90,18 @@ function initScrollAnimations() {
         });
     }, observerOptions);
 
-    document.querySelectorAll('[data-aos]').forEach(el => {
+    root.querySelectorAll('[data-aos]').forEach(el => {
         observer.observe(el);
     });
 }
 
-document.addEventListener('DOMContentLoaded', initScrollAnimations);
+document.addEventListener('DOMContentLoaded', () => initScrollAnimations());
 
 // ==========================================================================
 // Language bars animation
 // ==========================================================================
 
-function animateLanguageBars() {
+function animateLanguageBars(root = document) {
     const observer = new IntersectionObserver((entries) => {
         entries.forEach(entry => {
             if (entry.isIntersecting) {
@@ -110,19 +110,19 @@ function animateLanguageBars() {
         });
     }, { threshold: 0.5 });
 
-    document.querySelectorAll('.language-bar').forEach(bar => {
+    root.querySelectorAll('.language-bar').forEach(bar => {
         observer.observe(bar);
     });
 }
 
-document.addEventListener('DOMContentLoaded', animateLanguageBars);
+document.addEventListener('DOMContentLoaded', () => animateLanguageBars());
 
 // ==========================================================================
 // Card hover light effect
 // ==========================================================================
 
-function initCardHoverEffect() {
-    document.querySelectorAll('.project-card, .liquid-button-primary').forEach(card => {
+function initCardHoverEffect(root = document) {
+    root.querySelectorAll('.project-card, .liquid-button-primary').forEach(card => {
         card.addEventListener('mousemove', (e) => {
             const rect = card.getBoundingClientRect();
             const x = e.clientX - rect.left;
@@ -133,24 +133,32 @@ function initCardHoverEffect() {
     });
 }
 
-document.addEventListener('DOMContentLoaded', initCardHoverEffect);
+document.addEventListener('DOMContentLoaded', () => initCardHoverEffect());
 
 // ==========================================================================
 // Smooth scroll for anchor links
 // ==========================================================================
 
-document.querySelectorAll('a[href^="#"]').forEach(anchor => {
-    anchor.addEventListener('click', function(e) {
-        e.preventDefault();
-        const target = document.querySelector(this.getAttribute('href'));
-        if (target) {
-            target.scrollIntoView({
-                behavior: 'smooth',
-                block: 'start'
-            });
-        }
+function initSmoothScroll(root = document) {
+    root.querySelectorAll('a[href^="#"]').forEach(anchor => {
+        anchor.addEventListener('click', function(e) {
+            e.preventDefault();
+            const selector = this.getAttribute('href');
+            const target = document.querySelector(selector);
+            if (target) {
+                // Sections above the target may still be lazy placeholders
+                loadFragmentsUntil(target).then(() => {
+                    document.querySelector(selector)?.scrollIntoView({
+                        behavior: 'smooth',
+                        block: 'start'
+                    });
+                });
+            }
+        });
     });
-});
+}
+
+initSmoothScroll();
 
 // ==========================================================================
 // Navbar background on scroll
@@ -257,3 +265,244 @@ window.matchMedia('(prefers-color-scheme: dark)').addEventListener('change', (e)
         setTheme(e.matches ? 'dark' : 'light');
     }
 });
+
+// ==========================================================================
+// Effects toggle (full/low-power)
+// ==========================================================================
+
+const effectsToggles = ['effects-toggle', 'effects-toggle-mobile']
+    .map(id => document.getElementById(id))
+    .filter(Boolean);
+
+function setEffects(effects, remember = true) {
+    document.documentElement.setAttribute('data-effects', effects);
+    effectsToggles.forEach(button => button.setAttribute('aria-pressed', String(effects === 'low')));
+    if (remember) localStorage.setItem('effects', effects);
+}
+
+function toggleEffects() {
+    const current = document.documentElement.getAttribute('data-effects');
+    setEffects(current === 'low' ? 'full' : 'low');
+}
+
+effectsToggles.forEach(button => button.addEventListener('click', toggleEffects));
+setEffects(document.documentElement.getAttribute('data-effects'), false);
+
+// Follow reduced-motion changes unless the visitor picked a profile
+window.matchMedia('(prefers-reduced-motion: reduce)').addEventListener('change', (e) => {
+    if (!localStorage.getItem('effects')) {
+        setEffects(e.matches ? 'low' : 'full', false);
+    }
+});
+
+// ==========================================================================
+// Lazy-loaded section fragments
+// ==========================================================================
+
+const fragmentRequests = new Map();
+
+function activateScripts(nodes) {
+    // Scripts parsed from an HTML string do not run; recreate them. Deferred
+    // third-party scripts stay in place for activateThirdParty
+    const selector = 'script:not([data-third-party])';
+    nodes.forEach(node => {
+        if (node.nodeType !== Node.ELEMENT_NODE) return;
+        const scripts = node.matches(selector) ? [node] : node.querySelectorAll(selector);
+        scripts.forEach(old => {
+            const script = document.createElement('script');
+            [...old.attributes].forEach(attr => script.setAttribute(attr.name, attr.value));
+            script.textContent = old.textContent;
+            old.replaceWith(script);
+        });
+    });
+}
+
+function initSection(root) {
+    initScrollAnimations(root);
+    animateLanguageBars(root);
+    initCardHoverEffect(root);
+    initSmoothScroll(root);
+    initTechSearch(root);
+    applyTechFilter();
+}
+
+function loadFragment(placeholder) {
+    const url = placeholder.dataset.fragment;
+    if (!fragmentRequests.has(url)) {
+        const request = fetch(url)
+            .then(response => {
+                if (!response.ok) throw new Error(`Failed to load ${url}`);
+                return response.text();
+            })
+            .then(html => {
+                const template = document.createElement('template');
+                template.innerHTML = html;
+                const nodes = [...template.content.childNodes];
+                placeholder.replaceWith(...nodes);
+                activateScripts(nodes);
+                if (thirdPartyLoaded) nodes.forEach(activateThirdParty);
+                nodes.filter(node => node.nodeType === Node.ELEMENT_NODE).forEach(initSection);
+                updateActiveNavLink();
+            })
+            .catch(() => {
+                // Show the <noscript> link to the fragment instead
+                const fallback = placeholder.querySelector('noscript');
+                if (fallback) placeholder.innerHTML = fallback.textContent;
+            });
+        fragmentRequests.set(url, request);
+    }
+    return fragmentRequests.get(url);
+}
+
+function loadFragmentsUntil(target) {
+    const pending = [];
+    document.querySelectorAll('[data-fragment]').forEach(placeholder => {
+        const precedes = target.compareDocumentPosition(placeholder) & Node.DOCUMENT_POSITION_PRECEDING;
+        if (placeholder === target || precedes) {
+            pending.push(loadFragment(placeholder));
+        }
+    });
+    return Promise.all(pending);
+}
+
+function initFragmentLoader() {
+    const observer = new IntersectionObserver((entries) => {
+        entries.forEach(entry => {
+            if (entry.isIntersecting) {
+                observer.unobserve(entry.target);
+                loadFragment(entry.target);
+            }
+        });
+    }, { rootMargin: '800px 0px' });
+
+    document.querySelectorAll('[data-fragment]').forEach(placeholder => {
+        observer.observe(placeholder);
+    });
+}
+
+document.addEventListener('DOMContentLoaded', initFragmentLoader);
+
+// ==========================================================================
+// Technology search (index precomputed at build time)
+// ==========================================================================
+
+const searchIndexEl = document.getElementById('search-index');
+const searchIndex = searchIndexEl ? JSON.parse(searchIndexEl.textContent) : {};
+
+function normalizeTerm(term) {
+    // Must produce the keys of search.normalize_term() at build time
+    return term.toLowerCase().trim().split(/\s+/).join(' ');
+}
+
+function findSearchRefs(query) {
+    // Exact term first, otherwise every term starting with the query
+    const key = normalizeTerm(query);
+    if (!key) return null;
+    if (searchIndex[key]) return new Set(searchIndex[key][2]);
+    const refs = new Set();
+    Object.entries(searchIndex).forEach(([term, [, , termRefs]]) => {
+        if (term.startsWith(key)) termRefs.forEach(ref => refs.add(ref));
+    });
+    return refs;
+}
+
+function applyTechFilter() {
+    const input = document.getElementById('tech-search');
+    const refs = input ? findSearchRefs(input.value) : null;
+    let matches = 0;
+    document.querySelectorAll('[data-search-id]').forEach(card => {
+        const match = refs !== null && refs.has(card.dataset.searchId);
+        matches += match;
+        card.classList.toggle('search-match', match);
+        card.classList.toggle('search-dim', refs !== null && !match);
+    });
+    const count = document.getElementById('tech-search-count');
+    if (count) count.textContent = refs === null ? '' : `${matches} match${matches === 1 ? '' : 'es'}`;
+}
+
+function initTechSearch(root = document) {
+    const input = root.querySelector('#tech-search');
+    if (!input || input.dataset.ready) return;
+    input.dataset.ready = 'true';
+
+    // Suggest terms by usage count; the index is already sorted
+    const datalist = root.querySelector('#tech-search-terms');
+    Object.values(searchIndex).forEach(([label]) => {
+        const option = document.createElement('option');
+        option.value = label;
+        datalist.appendChild(option);
+    });
+
+    input.addEventListener('input', applyTechFilter);
+    input.addEventListener('change', () => {
+        // Lazy sections may hold matching cards; load them before scrolling
+        const placeholders = [...document.querySelectorAll('[data-fragment]')];
+        Promise.all(placeholders.map(loadFragment)).then(() => {
+            applyTechFilter();
+            document.querySelector('.search-match')?.scrollIntoView({ behavior: 'smooth', block: 'center' });
+        });
+    });
+}
+
+document.addEventListener('DOMContentLoaded', () => initTechSearch());
+
+// ==========================================================================
+// Third-party scripts (analytics, embeds), kept off the critical path
+// ==========================================================================
+
+let thirdPartyLoaded = false;
+
+function activateThirdParty(root = document) {
+    // Embed scripts are rendered inert (type="text/plain"); restore their type
+    if (!root.querySelectorAll) return;
+    const scripts = root.matches?.('script[data-third-party]') ? [root] : root.querySelectorAll('script[data-third-party]');
+    scripts.forEach(old => {
+        const script = document.createElement('script');
+        [...old.attributes]
+            .filter(attr => attr.name !== 'type' && attr.name !== 'data-third-party')
+            .forEach(attr => script.setAttribute(attr.name, attr.value));
+        if (old.dataset.thirdParty) script.type = old.dataset.thirdParty;
+        script.textContent = old.textContent;
+        old.replaceWith(script);
+    });
+}
+
+function loadThirdParty() {
+    if (thirdPartyLoaded) return;
+    thirdPartyLoaded = true;
+    activateThirdParty();
+}
+{% if third_party == 'idle' %}
+
+window.addEventListener('load', () => {
+    if ('requestIdleCallback' in window) {
+        requestIdleCallback(loadThirdParty, { timeout: 5000 });
+    } else {
+        setTimeout(loadThirdParty, 2000);
+    }
+});
+{% elif third_party == 'interaction' %}
+
+const interactionEvents = ['pointerdown', 'keydown', 'touchstart', 'scroll', 'wheel'];
+
+function onFirstInteraction() {
+    interactionEvents.forEach(type => window.removeEventListener(type, onFirstInteraction));
+    loadThirdParty();
+}
+
+interactionEvents.forEach(type => {
+    window.addEventListener(type, onFirstInteraction, { passive: true });
+});
+{% endif %}
+{% if service_worker %}
+
+// ==========================================================================
+// Service worker (instant repeat and offline visits)
+// ==========================================================================
+
+if ('serviceWorker' in navigator && location.protocol.startsWith('http')) {
+    window.addEventListener('load', () => {
+        navigator.serviceWorker.register('sw.js');
+    });
+}
+{% endif %}
@@ -0,0 +1,123 @@
+// Generated by cvcompiler - do not edit.
+// Cache-first for the CV's own assets, stale-while-revalidate for the page
+// and third-party origins. Only assets whose content hash changed since the
+// previous build are downloaded again on update. A new version waits until
+// no page of the previous one is open, so their assets stay cached meanwhile.
+
+const PRECACHE = 'cv-precache-v1';
+const RUNTIME = 'cv-runtime-v1';
+const MANIFEST_KEY = '__precache-manifest';
+const SHELL_URL = './';
+
+const PRECACHE_MANIFEST = {{ manifest|tojson }};
+const RUNTIME_ORIGINS = {{ runtime_origins|tojson }};
+
+function toAbsolute(url) {
+    return new URL(url, self.registration.scope).href;
+}
+
+function isPageUrl(url) {
+    // The CV itself; other pages under the same scope are not ours to serve
+    const scope = new URL(self.registration.scope);
+    return url.origin === scope.origin
+        && (url.pathname === scope.pathname || url.pathname === `${scope.pathname}index.html`);
+}
+
+async function readStoredManifest(cache) {
+    const response = await cache.match(MANIFEST_KEY);
+    return response ? response.json() : [];
+}
+
+// ==========================================================================
+// Install: fetch new or changed assets only
+// ==========================================================================
+
+async function precache() {
+    const cache = await caches.open(PRECACHE);
+    const stored = new Map((await readStoredManifest(cache)).map(entry => [entry.url, entry.revision]));
+
+    const pending = [];
+    for (const entry of PRECACHE_MANIFEST) {
+        const key = toAbsolute(entry.url);
+        const unchanged = stored.get(entry.url) === entry.revision && await cache.match(key);
+        if (!unchanged) {
+            pending.push(fetch(entry.url, { cache: 'reload' }).then(response => {
+                if (!response.ok) throw new Error(`Failed to precache ${entry.url}`);
+                return cache.put(key, response);
+            }));
+        }
+    }
+    pending.push(cache.add(new Request(SHELL_URL, { cache: 'reload' })));
+    await Promise.all(pending);
+}
+
+self.addEventListener('install', (event) => {
+    event.waitUntil(precache());
+});
+
+// ==========================================================================
+// Activate: drop assets removed from the manifest and old caches
+// ==========================================================================
+
+async function cleanup() {
+    const cache = await caches.open(PRECACHE);
+    const keep = new Set([toAbsolute(SHELL_URL), ...PRECACHE_MANIFEST.map(entry => toAbsolute(entry.url))]);
+    for (const request of await cache.keys()) {
+        if (!keep.has(request.url) && !request.url.endsWith(MANIFEST_KEY)) {
+            await cache.delete(request);
+        }
+    }
+    await cache.put(MANIFEST_KEY, new Response(JSON.stringify(PRECACHE_MANIFEST)));
+
+    for (const name of await caches.keys()) {
+        if (name !== PRECACHE && name !== RUNTIME) {
+            await caches.delete(name);
+        }
+    }
+}
+
+self.addEventListener('activate', (event) => {
+    event.waitUntil(cleanup());
+});
+
+// ==========================================================================
+// Fetch strategies
+// ==========================================================================
+
+async function cacheFirst(request) {
+    const cached = await caches.match(request);
+    return cached || fetch(request);
+}
+
+async function staleWhileRevalidate(event, cacheName, key) {
+    const cache = await caches.open(cacheName);
+    const cached = await cache.match(key);
+    const network = fetch(event.request).then(response => {
+        if (response.ok || response.type === 'opaque') {
+            cache.put(key, response.clone());
+        }
+        return response;
+    });
+
+    if (cached) {
+        event.waitUntil(network.catch(() => undefined));
+        return cached;
+    }
+    return network;
+}
+
+self.addEventListener('fetch', (event) => {
+    const request = event.request;
+    if (request.method !== 'GET') return;
+
+    const url = new URL(request.url);
+    if (request.mode === 'navigate') {
+        if (isPageUrl(url)) {
+            event.respondWith(staleWhileRevalidate(event, PRECACHE, toAbsolute(SHELL_URL)));
+        }
+    } else if (url.origin === self.location.origin) {
+        event.respondWith(cacheFirst(request));
+    } else if (RUNTIME_ORIGINS.includes(url.origin)) {
+        event.respondWith(staleWhileRevalidate(event, RUNTIME, request));
+    }
+});
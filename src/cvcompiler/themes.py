@@ -45,6 +45,8 @@ class ThemeEffects:
     blur_amount: str
     glass_opacity: float
     border_opacity: float
+    # Glass background used without backdrop blur (low-power effects profile)
+    low_power_glass_bg: str = ""
 
 
 @dataclass
@@ -63,12 +65,19 @@ class Theme:
             lines.append(f"    --{css_name}: {value};")
         return lines
 
+    def _low_power_glass_bg(self) -> str:
+        """Unblurred glass needs to be more opaque to keep text readable."""
+        if self.effects.low_power_glass_bg:
+            return self.effects.low_power_glass_bg
+        return f"color-mix(in srgb, {self.colors.glass_bg} 40%, {self.colors.bg_secondary})"
+
     def _effect_css_vars(self) -> list[str]:
         """Generate CSS variables for theme effects."""
         return [
             f"    --blur-amount: {self.effects.blur_amount};",
             f"    --glass-opacity: {self.effects.glass_opacity};",
             f"    --border-opacity: {self.effects.border_opacity};",
+            f"    --low-power-glass-bg: {self._low_power_glass_bg()};",
         ]
 
     def _css_variable_lines(self) -> list[str]:
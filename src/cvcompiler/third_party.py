@@ -0,0 +1,100 @@
+"""Deferred loading of analytics and third-party embed scripts."""
+
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Literal
+
+from markupsafe import Markup
+
+from .models import CV
+
+type LoadStrategy = Literal["idle", "interaction", "never"]
+LOAD_STRATEGIES: tuple[LoadStrategy, ...] = ("idle", "interaction", "never")
+
+GOOGLE_ANALYTICS_ORIGIN = "https://www.googletagmanager.com"
+
+# Render-critical font origins used by every page (stylesheet + font files)
+FONT_ORIGINS = [
+    ("https://fonts.googleapis.com", False),
+    ("https://fonts.gstatic.com", True),
+]
+
+SCRIPT_TAG_PATTERN = re.compile(
+    r"<script\b([^>]*)>(.*?)</script>", re.DOTALL | re.IGNORECASE
+)
+TYPE_ATTR_PATTERN = re.compile(
+    r"""\s+type\s*=\s*("[^"]*"|'[^']*'|\S+)""", re.IGNORECASE
+)
+# Script types browsers execute; others (e.g. application/ld+json) stay as is
+EXECUTABLE_SCRIPT_TYPES = frozenset(
+    {"", "text/javascript", "application/javascript", "module"}
+)
+SCRIPT_URL_PATTERN = re.compile(
+    r"""(?:https?:)?//([a-z0-9-]+(?:\.[a-z0-9-]+)+)""", re.IGNORECASE
+)
+
+
+@dataclass(frozen=True)
+class Preconnect:
+    origin: str
+    crossorigin: bool = False
+
+
+def defer_scripts(html: str) -> Markup:
+    """Make executable embed <script> tags inert until the page loads third parties.
+
+    Scripts get type="text/plain" and a data-third-party marker holding their
+    original type; scripts.js turns them back into executable scripts on idle
+    or first interaction. Data blocks such as JSON-LD are left untouched.
+    """
+
+    def replace(match: re.Match[str]) -> str:
+        attrs = match.group(1)
+        type_attr = TYPE_ATTR_PATTERN.search(attrs)
+        script_type = (
+            type_attr.group(1).strip("\"'").strip().lower() if type_attr else ""
+        )
+        if script_type not in EXECUTABLE_SCRIPT_TYPES:
+            return match.group(0)
+        attrs = TYPE_ATTR_PATTERN.sub("", attrs)
+        return (
+            f'<script type="text/plain" data-third-party="{script_type}"{attrs}>'
+            f"{match.group(2)}</script>"
+        )
+
+    return Markup(SCRIPT_TAG_PATTERN.sub(replace, html))
+
+
+def _iter_embeds(cv: CV) -> Iterator[str]:
+    for blocks in cv.html_embeds.values():
+        yield from blocks
+    for cert in cv.certifications:
+        if cert.html_embed:
+            yield cert.html_embed
+
+
+def embed_script_origins(cv: CV) -> list[str]:
+    """Origins that embed scripts load from, in order of first appearance."""
+    origins: list[str] = []
+    for html in _iter_embeds(cv):
+        for attrs, body in SCRIPT_TAG_PATTERN.findall(html):
+            for host in SCRIPT_URL_PATTERN.findall(attrs + body):
+                origin = f"https://{host.lower()}"
+                if origin not in origins:
+                    origins.append(origin)
+    return origins
+
+
+def preconnect_hints(cv: CV, strategy: LoadStrategy) -> list[Preconnect]:
+    """Preconnect hints for the external origins this page actually uses."""
+    hints = [Preconnect(origin, crossorigin) for origin, crossorigin in FONT_ORIGINS]
+    if strategy == "never":
+        return hints
+
+    origins = embed_script_origins(cv)
+    if cv.google_analytics_id:
+        origins.insert(0, GOOGLE_ANALYTICS_ORIGIN)
+    known = {hint.origin for hint in hints}
+    hints.extend(Preconnect(o) for o in dict.fromkeys(origins) if o not in known)
+    return hints